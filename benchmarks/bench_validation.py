@@ -0,0 +1,307 @@
+"""Benchmark the Excel read + validate pipeline stage by stage.
+
+Every case (rule x size x variant x converter) runs in a freshly spawned
+process, so the peak RSS reported for it is not inflated by earlier cases.
+With --chunked, the chunked read + validate path runs as a case of its own,
+in its own process, and must report the same errors as the whole-file case.
+Results are written to JSON and can be compared against an earlier run:
+
+    python -m benchmarks.bench_validation --sizes 1000 100000 --output before.json
+    python -m benchmarks.bench_validation --sizes 1000 100000 --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.workbooks import DEFAULT_CACHE_DIR, VARIANTS, get_workbook
+from config.rules import VALIDATION_RULES
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+
+CONVERTERS = ("xlsx2csv", "pandas")
+
+RESPONSE_FORMATS = ("json", "columns", "ndjson", "arrow", "parquet")
+
+# Stage names, in pipeline order
+STAGES = ("upload", "convert", "validate", "serialize", "total", "chunked")
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _timed(results: Dict[str, Dict[str, float]], stage: str, rows: int, func: Callable, *args) -> Any:
+    """Run one stage and record its duration, throughput and peak RSS."""
+    start = time.perf_counter()
+    value = func(*args)
+    seconds = time.perf_counter() - start
+    results[stage] = {
+        "seconds": round(seconds, 6),
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+    return value
+
+
+def _spool_upload(path: str) -> str:
+    """Spool a workbook through an ``UploadFile``, as the validation endpoint does."""
+    from fastapi import UploadFile
+
+    from services.file_readers import FileReader
+
+    with open(path, "rb") as source:
+        upload = UploadFile(source, filename=os.path.basename(path))
+        return asyncio.run(FileReader.spool_to_disk(upload))
+
+
+def _serialize(result: Any) -> bytes:
+    """Produce the response body the endpoint would send for a rendered result."""
+    from schemas.validation_response import ValidationResponse
+    from services.response_formats import iter_ndjson
+
+    if isinstance(result, ValidationResponse):
+        return result.model_dump_json().encode("utf-8")
+    if isinstance(result, pd.DataFrame):
+        return b"".join(iter_ndjson(result))
+    return result
+
+
+def _errors_digest(error_rows: Dict[int, List[str]]) -> str:
+    """Fingerprint an error map, so cases in different processes can be compared."""
+    return hashlib.sha256(json.dumps(error_rows, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def run_case(
+    rule_id: str,
+    rows: int,
+    variant: str,
+    converter_name: str,
+    response_format: str,
+    chunked: bool,
+    cache_dir: str,
+) -> Dict[str, Any]:
+    """Benchmark one workbook with one converter; meant to run in its own process.
+
+    Args:
+        rule_id: ID of validation rules in config/rules.py
+        rows: Number of data rows in the workbook
+        variant: "clean", "dirty", "all_dirty" or "numeric_codes"
+        converter_name: "xlsx2csv" or "pandas"
+        response_format: Format the result is serialized to
+        chunked: Whether to time the chunked read + validate path instead of
+            the whole-file stages
+        cache_dir: Directory holding the generated workbooks
+
+    Returns:
+        Case description with per-stage seconds, rows per second and peak RSS,
+        and a digest of the errors found
+    """
+    logging.disable(logging.INFO)
+
+    from services.file_readers import FileReader, PandasConverter, Xlsx2csvConverter
+    from services.response_formats import render_validation_result
+    from services.validators import Validator
+
+    path = get_workbook(rule_id, rows, variant, cache_dir)
+    converter = Xlsx2csvConverter() if converter_name == "xlsx2csv" else PandasConverter()
+    file_reader = FileReader(converter)
+    validator = Validator(VALIDATION_RULES)
+
+    stages: Dict[str, Dict[str, float]] = {}
+    baseline_rss = _peak_rss_mb()
+    start = time.perf_counter()
+
+    if chunked:
+        dtype = validator.get_reader_dtypes(rule_id)
+
+        def read_and_validate_chunks() -> Tuple[Any, Optional[pd.DataFrame]]:
+            chunks = file_reader.iter_path_chunks(path, dtype=dtype)
+            try:
+                return validator.validate_chunks_frame(chunks, rule_id)
+            finally:
+                chunks.close()
+
+        errors, _ = _timed(stages, "chunked", rows, read_and_validate_chunks)
+        response_bytes = None
+    else:
+        spooled = _timed(stages, "upload", rows, _spool_upload, path)
+        try:
+            df = _timed(
+                stages, "convert", rows, file_reader.read_excel_path, spooled, validator.get_reader_dtypes(rule_id)
+            )
+        finally:
+            os.remove(spooled)
+        errors, validated = _timed(stages, "validate", rows, validator.validate_frame, df, rule_id)
+        body = _timed(
+            stages, "serialize", rows,
+            lambda: _serialize(render_validation_result(errors, validated, response_format))
+        )
+
+        response_bytes = len(body)
+        seconds = time.perf_counter() - start
+        stages["total"] = {
+            "seconds": round(seconds, 6),
+            "rows_per_second": round(rows / seconds, 1),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        }
+
+    error_rows = errors.to_rows()
+    return {
+        "rule_id": rule_id,
+        "rows": rows,
+        "variant": variant,
+        "converter": converter_name,
+        "response_format": response_format,
+        "mode": "chunked" if chunked else "full",
+        "file_bytes": os.path.getsize(path),
+        "error_rows": len(error_rows),
+        "errors_digest": _errors_digest(error_rows),
+        "response_bytes": response_bytes,
+        # Filled in by main for chunked cases, once the whole-file case is known
+        "modes_agree": None,
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "stages": stages,
+    }
+
+
+def _case_key(case: Dict[str, Any]) -> Tuple:
+    """Identify a case across runs."""
+    return (
+        case["rule_id"], case["rows"], case["variant"], case["converter"], case["response_format"],
+        case.get("mode", "full"),
+    )
+
+
+def _git_commit() -> Optional[str]:
+    """Commit of the working tree being benchmarked, if it is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata() -> Dict[str, Any]:
+    """Environment details stored next to the results."""
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def format_case(case: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Render one case as a line per stage, with ratios against a baseline case."""
+    lines = [
+        f"rule {case['rule_id']} | {case['rows']} rows | {case['variant']} | "
+        f"{case['converter']} | {case['response_format']} | {case.get('mode', 'full')} | "
+        f"{case['error_rows']} error rows"
+        + (f" | {case['response_bytes'] / 1024:.0f} KiB response" if case.get("response_bytes") is not None else "")
+        + (" | errors differ from whole-file" if case.get("modes_agree") is False else "")
+    ]
+    for stage in STAGES:
+        if stage not in case["stages"]:
+            continue
+        result = case["stages"][stage]
+        line = f"  {stage:<10} {result['seconds']:>9.3f}s {result['peak_rss_mb']:>9.1f} MiB"
+        if baseline and stage in baseline["stages"]:
+            before = baseline["stages"][stage]
+            ratio = result["seconds"] / before["seconds"] if before["seconds"] else float("nan")
+            line += (
+                f"   x{ratio:.2f} time, "
+                f"{result['peak_rss_mb'] - before['peak_rss_mb']:+.1f} MiB"
+            )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--rules", nargs="+", default=list(VALIDATION_RULES), choices=list(VALIDATION_RULES))
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=VARIANTS)
+    parser.add_argument("--converters", nargs="+", default=list(CONVERTERS), choices=CONVERTERS)
+    parser.add_argument("--response-format", default="json", choices=RESPONSE_FORMATS)
+    parser.add_argument("--chunked", action="store_true", help="Also time the chunked read + validate path, as separate cases, and check that it reports the same errors")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for generated workbooks")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run every requested case and write the results."""
+    args = parse_args(argv)
+    baseline_cases = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline_cases = {_case_key(case): case for case in json.load(f)["cases"]}
+
+    # Generate workbooks up front so generation never counts toward a case
+    for rule_id in args.rules:
+        for rows in args.sizes:
+            for variant in args.variants:
+                get_workbook(rule_id, rows, variant, args.cache_dir)
+
+    context = multiprocessing.get_context("spawn")
+    cases = []
+    for rule_id in args.rules:
+        for rows in args.sizes:
+            for variant in args.variants:
+                for converter_name in args.converters:
+                    full_case = None
+                    for chunked in (False, True) if args.chunked else (False,):
+                        with context.Pool(1) as pool:
+                            case = pool.apply(run_case, (
+                                rule_id, rows, variant, converter_name, args.response_format,
+                                chunked, args.cache_dir,
+                            ))
+                        if chunked:
+                            case["modes_agree"] = case["errors_digest"] == full_case["errors_digest"]
+                        else:
+                            full_case = case
+                        cases.append(case)
+                        print(format_case(case, baseline_cases.get(_case_key(case))), flush=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"metadata": run_metadata(), "cases": cases}, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {args.output}")
+
+    disagreeing = [case for case in cases if case["modes_agree"] is False]
+    for case in disagreeing:
+        print(
+            f"Chunked and whole-file validation report different errors: rule {case['rule_id']}, "
+            f"{case['rows']} rows, {case['variant']}, {case['converter']}",
+            file=sys.stderr,
+        )
+    if disagreeing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+"""Load test for the /tax API against a local PostgreSQL.
+
+Starts the API with uvicorn once per connection mode (USE_POOL=True as
+"pool", USE_POOL=False as "direct"), seeds tax codes through
+/tax/bulk_create and drives mixed create/update/search/dropdown traffic at
+each concurrency level, reporting p50/p95/p99 latency and requests per
+second per operation.
+
+Without --database-url a throwaway cluster is started with initdb/pg_ctl
+(from --pg-bin or PATH, or the optional pgserver package) and the procedure
+stub in data/sql is installed. With --database-url the seeded rows carry a
+per-run prefix and are deleted afterwards; pass --install-stub to install
+the stub procedures there too.
+
+    python -m benchmarks.load_test_tax --seed-rows 10000 --concurrency 1 8 32
+    python -m benchmarks.load_test_tax --database-url postgresql://... --modes pool --duration 30
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import psycopg
+
+from benchmarks.bench_validation import run_metadata
+
+MODES = ("pool", "direct")
+
+OPERATIONS = ("create", "update", "search", "dropdown")
+
+DEFAULT_MIX = "create=1,update=2,search=5,dropdown=2"
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sql")
+
+# Applied in order when installing the stub
+STUB_SQL_FILES = ("tax_code_ref_stub.sql", "sp_tax_code_ref_search_after.sql", "tax_code_ref_notify.sql")
+
+# Rows sent per /tax/bulk_create and /tax/delete request while seeding and cleaning up
+SEED_REQUEST_ROWS = 5000
+
+SEARCH_PAGE_SIZE = 20
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def local_postgres(pg_bin: Optional[str] = None) -> Iterator[str]:
+    """Run a throwaway PostgreSQL cluster for the duration of the block.
+
+    Args:
+        pg_bin: Directory holding initdb and pg_ctl; looked up on PATH if None
+
+    Yields:
+        Connection string of the cluster
+
+    Raises:
+        SystemExit: If neither PostgreSQL binaries nor pgserver are available
+    """
+    data_dir = tempfile.mkdtemp(prefix="tax-load-pg-")
+    initdb = os.path.join(pg_bin, "initdb") if pg_bin else shutil.which("initdb")
+    try:
+        if initdb and os.path.exists(initdb):
+            pg_ctl = os.path.join(os.path.dirname(initdb), "pg_ctl")
+            port = _free_port()
+            subprocess.run(
+                [initdb, "-D", data_dir, "-U", "postgres", "-A", "trust"],
+                check=True, capture_output=True
+            )
+            subprocess.run(
+                [pg_ctl, "-D", data_dir, "-w", "-l", os.path.join(data_dir, "server.log"),
+                 "-o", f"-p {port} -k {data_dir} -c listen_addresses='' -c max_connections=200", "start"],
+                check=True, capture_output=True
+            )
+            try:
+                yield f"postgresql://postgres@/postgres?host={data_dir}&port={port}"
+            finally:
+                subprocess.run([pg_ctl, "-D", data_dir, "-m", "fast", "stop"], capture_output=True)
+            return
+
+        try:
+            import pgserver
+        except ImportError:
+            raise SystemExit(
+                "No PostgreSQL found: put initdb/pg_ctl on PATH, pass --pg-bin or --database-url, "
+                "or install pgserver"
+            )
+        server = pgserver.get_server(data_dir, cleanup_mode="stop")
+        try:
+            yield server.get_uri()
+        finally:
+            server.cleanup()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def install_stub(database_url: str) -> None:
+    """Create the tax_code_ref table and procedures from data/sql.
+
+    Args:
+        database_url: Connection string of the target database
+    """
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        for name in STUB_SQL_FILES:
+            with open(os.path.join(SQL_DIR, name), encoding="utf-8") as f:
+                conn.execute(f.read())
+
+
+def serve(database_url: str, mode: str, async_db: bool, port: int, cache: bool, max_conn: int) -> None:
+    """Run the API with uvicorn; the target of the server process.
+
+    Config values are overridden before the application is imported, since
+    modules read them at import time.
+    """
+    import config.config as config
+
+    config.DATABASE_URL = database_url
+    config.USE_POOL = mode == "pool"
+    config.USE_ASYNC_DB = async_db
+    config.MAX_CONN = max_conn
+    config.MIN_CONN = min(config.MIN_CONN, max_conn)
+    if not cache:
+        config.TAX_CACHE_MAX_SIZE = 0
+
+    import uvicorn
+    from main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+@contextlib.contextmanager
+def running_api(database_url: str, mode: str, args: argparse.Namespace) -> Iterator[str]:
+    """Start the API in a separate process and stop it when the block exits.
+
+    Args:
+        database_url: Connection string the API connects to
+        mode: "pool" or "direct"
+        args: Parsed command line arguments
+
+    Yields:
+        Base URL of the running API
+
+    Raises:
+        RuntimeError: If the API does not come up within 60 seconds
+    """
+    port = _free_port()
+    process = multiprocessing.get_context("spawn").Process(
+        target=serve,
+        args=(database_url, mode, args.async_db, port, not args.no_cache, args.max_conn),
+        daemon=True,
+    )
+    process.start()
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if not process.is_alive():
+                raise RuntimeError(f"API process exited with code {process.exitcode}")
+            try:
+                if httpx.get(f"{base_url}/openapi.json", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("API did not start within 60 seconds")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.join(10)
+        if process.is_alive():
+            process.kill()
+
+
+def _tax_item(tax_code_rcd: str, seq_num: int, rng: random.Random) -> Dict[str, Any]:
+    """Body of one tax code for create requests."""
+    return {
+        "tax_code_rcd": tax_code_rcd,
+        "tax_rule_rcd": f"R{seq_num % 10}",
+        "tax_code_ref_name_e": f"Tax {tax_code_rcd}",
+        "tax_code_ref_name_l": f"Thuế {tax_code_rcd}",
+        "seq_num": seq_num,
+        "must_not_change_flag": False,
+        "user_defined_rate_flag": False,
+        "created_by_user_id": "loadtest",
+        "tax_rate": round(rng.random() * 20, 2),
+    }
+
+
+def _batches(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Split a list into consecutive batches."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def seed(base_url: str, keys: List[str]) -> None:
+    """Create the seed tax codes through /tax/bulk_create.
+
+    Raises:
+        RuntimeError: If any row fails to be created
+    """
+    rng = random.Random(0)
+    with httpx.Client(base_url=base_url, timeout=300) as client:
+        for offset in range(0, len(keys), SEED_REQUEST_ROWS):
+            batch = keys[offset:offset + SEED_REQUEST_ROWS]
+            response = client.post(
+                "/tax/bulk_create",
+                params={"batch_size": 1000},
+                json=[_tax_item(key, offset + i, rng) for i, key in enumerate(batch)],
+            )
+            response.raise_for_status()
+            result = response.json()["result"]
+            if result["failed"]:
+                raise RuntimeError(f"Seeding failed: {result['errors'][:3]}")
+
+
+def cleanup(base_url: str, keys: List[str]) -> None:
+    """Delete the seeded and created tax codes through /tax/delete."""
+    with httpx.Client(base_url=base_url, timeout=300) as client:
+        for batch in _batches(keys, SEED_REQUEST_ROWS):
+            client.request(
+                "DELETE", "/tax/delete",
+                json={"json_list_id": json.dumps(batch), "updated_by": "loadtest"},
+            ).raise_for_status()
+
+
+class TrafficState:
+    """Keys shared by the workers of one run."""
+
+    def __init__(self, prefix: str, seed_keys: List[str]):
+        """Initialize with the run prefix and the seeded keys."""
+        self.prefix = prefix
+        self.seed_keys = seed_keys
+        self.created: List[str] = []
+        self._counter = itertools.count()
+
+    def new_key(self) -> str:
+        """Return an unused tax code for a create request."""
+        key = f"{self.prefix}N{next(self._counter):07d}"
+        self.created.append(key)
+        return key
+
+
+def _succeeded(response: httpx.Response) -> bool:
+    """Whether a response counts as a success; write endpoints report errors in the body."""
+    if response.status_code >= 400:
+        return False
+    if response.request.method == "GET":
+        return True
+    return response.json().get("message") != "error"
+
+
+async def _request(client: httpx.AsyncClient, operation: str, rng: random.Random, state: TrafficState) -> httpx.Response:
+    """Send one request of the given operation."""
+    if operation == "create":
+        return await client.post("/tax/create", json=[_tax_item(state.new_key(), 0, rng)])
+    if operation == "update":
+        item = _tax_item(rng.choice(state.seed_keys), rng.randint(1, 1000), rng)
+        item.update(status=1, lu_user_id="loadtest")
+        return await client.put("/tax/update", json=[item])
+    lang = rng.choice(("e", "l"))
+    if operation == "search":
+        pages = max(1, len(state.seed_keys) // SEARCH_PAGE_SIZE)
+        return await client.get("/tax/search", params={
+            "page_index": rng.randint(1, min(pages, 50)), "page_size": SEARCH_PAGE_SIZE, "lang": lang
+        })
+    return await client.get("/tax/dropdown", params={"lang": lang})
+
+
+async def drive(
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    mix: Dict[str, int],
+    state: TrafficState,
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    """Send requests from ``concurrency`` closed-loop workers.
+
+    Requests started during the warmup are sent but not recorded.
+
+    Returns:
+        Latencies in seconds and error counts per operation, and the length
+        of the measured window in seconds
+    """
+    operations = [op for op in OPERATIONS if mix.get(op)]
+    weights = [mix[op] for op in operations]
+    latencies: Dict[str, List[float]] = {op: [] for op in operations}
+    errors: Dict[str, int] = {op: 0 for op in operations}
+    measure_start = time.perf_counter() + warmup
+    end = measure_start + duration
+
+    async def worker(client: httpx.AsyncClient, rng: random.Random) -> None:
+        while time.perf_counter() < end:
+            operation = rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            try:
+                ok = _succeeded(await _request(client, operation, rng, state))
+            except httpx.HTTPError:
+                ok = False
+            if start >= measure_start:
+                latencies[operation].append(time.perf_counter() - start)
+                if not ok:
+                    errors[operation] += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        await asyncio.gather(*(worker(client, random.Random(i)) for i in range(concurrency)))
+    return latencies, errors, max(time.perf_counter() - measure_start, 1e-9)
+
+
+def summarize(latencies: List[float], errors: int, window: float) -> Dict[str, Any]:
+    """Request count, errors, throughput and latency percentiles in milliseconds."""
+    if not latencies:
+        return {"requests": 0, "errors": errors, "rps": 0.0, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / window, 1),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+    }
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse "create=1,update=2,..." into operation weights."""
+    mix = {}
+    for part in value.split(","):
+        operation, _, weight = part.partition("=")
+        if operation.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {operation!r}, expected one of {OPERATIONS}")
+        mix[operation.strip()] = int(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("At least one operation needs a positive weight")
+    return mix
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Use this database instead of starting a throwaway cluster")
+    parser.add_argument("--pg-bin", help="Directory with initdb and pg_ctl")
+    parser.add_argument("--install-stub", action="store_true", help="Install the stub procedures into --database-url")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--async-db", action="store_true", help="Run the API with USE_ASYNC_DB=True")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the tax lookup cache")
+    parser.add_argument("--max-conn", type=int, default=10, help="Pool size in pool mode")
+    parser.add_argument("--seed-rows", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=15, help="Measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds before each level")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Default: {DEFAULT_MIX}")
+    parser.add_argument("--keep-data", action="store_true", help="Do not delete seeded and created rows")
+    parser.add_argument("--output", default="load_results.json", help="Where to write the JSON results")
+    return parser.parse_args(argv)
+
+
+def run(database_url: str, args: argparse.Namespace, owns_database: bool) -> List[Dict[str, Any]]:
+    """Seed the database and run every mode and concurrency level."""
+    prefix = f"LT{uuid.uuid4().hex[:6]}-"
+    seed_keys = [f"{prefix}S{i:07d}" for i in range(args.seed_rows)]
+    state = TrafficState(prefix, seed_keys)
+    results = []
+    seeded = False
+    try:
+        for mode in args.modes:
+            with running_api(database_url, mode, args) as base_url:
+                if not seeded:
+                    seed(base_url, seed_keys)
+                    seeded = True
+                for concurrency in args.concurrency:
+                    latencies, errors, window = asyncio.run(
+                        drive(base_url, concurrency, args.duration, args.warmup, args.mix, state)
+                    )
+                    level = {
+                        "mode": mode,
+                        "async_db": args.async_db,
+                        "concurrency": concurrency,
+                        "operations": {op: summarize(latencies[op], errors[op], window) for op in latencies},
+                        "all": summarize(
+                            [value for values in latencies.values() for value in values],
+                            sum(errors.values()), window
+                        ),
+                    }
+                    results.append(level)
+                    print(format_level(level), flush=True)
+    finally:
+        if seeded and not owns_database and not args.keep_data:
+            with running_api(database_url, args.modes[0], args) as base_url:
+                cleanup(base_url, seed_keys + state.created)
+    return results
+
+
+def format_level(level: Dict[str, Any]) -> str:
+    """Render one mode and concurrency level as a small table."""
+    lines = [f"{level['mode']} (async_db={level['async_db']}), concurrency {level['concurrency']}"]
+    rows = list(level["operations"].items()) + [("all", level["all"])]
+    for operation, result in rows:
+        if not result["requests"]:
+            lines.append(f"  {operation:<9} no requests")
+            continue
+        lines.append(
+            f"  {operation:<9} {result['requests']:>7} req {result['errors']:>5} err "
+            f"{result['rps']:>8.1f} req/s  p50 {result['p50_ms']:>8.2f} ms  "
+            f"p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the load test and write the results."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.database_url:
+        if args.install_stub:
+            install_stub(args.database_url)
+        results = run(args.database_url, args, owns_database=False)
+    else:
+        with local_postgres(args.pg_bin) as database_url:
+            install_stub(database_url)
+            results = run(database_url, args, owns_database=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "metadata": dict(run_metadata(), seed_rows=args.seed_rows, mix=args.mix, cache=not args.no_cache),
+            "levels": results,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Synthetic Excel workbooks for benchmarking the read + validate pipeline."""
+import os
+import tempfile
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from config.rules import VALIDATION_RULES
+
+# Share of rows holding one invalid cell in the "dirty" variant; in the
+# "all_dirty" variant every cell of every row is invalid. "numeric_codes" is
+# clean except that string columns hold numbers, which text-based readers
+# accept and typed readers reject; whole-file and chunked reads must agree
+DIRTY_ROW_RATIO = 0.01
+
+VARIANTS = ("clean", "dirty", "all_dirty", "numeric_codes")
+
+# Where generated workbooks are kept between runs
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "validate-data-bench")
+
+
+def _valid_values(dtype: Any, rows: int, rng: np.random.Generator) -> List[Any]:
+    """Values that pass the validator for one column type."""
+    if dtype is int:
+        return rng.integers(0, 100, rows).tolist()
+    if dtype is float:
+        return np.round(rng.random(rows) * 100, 2).tolist()
+    if dtype == "datetime":
+        days = rng.integers(0, 3650, rows)
+        return (pd.Timestamp("2015-01-01") + pd.to_timedelta(days, unit="D")).to_pydatetime().tolist()
+    codes = rng.integers(0, 36 ** 6, rows)
+    return [f"MST{np.base_repr(code, 36)}" for code in codes]
+
+
+def _invalid_value(dtype: Any) -> Any:
+    """A value the validator rejects for one column type, whatever the converter."""
+    if dtype in (int, float, "datetime"):
+        return "khang"
+    # Numbers in string columns read back as text through xlsx2csv; an empty
+    # cell is missing for every converter
+    return None
+
+
+def generate_frame(rule_id: str, rows: int, variant: str = "clean", seed: int = 0) -> pd.DataFrame:
+    """Build a DataFrame with the columns of a rule, in the style of data/test_100k.xlsx.
+
+    Args:
+        rule_id: ID of validation rules in config/rules.py
+        rows: Number of data rows
+        variant: "clean", "dirty" (DIRTY_ROW_RATIO of rows hold one bad cell),
+            "all_dirty" (every cell is invalid) or "numeric_codes" (string
+            columns hold numbers)
+        seed: Random seed, so every run benchmarks the same data
+
+    Returns:
+        DataFrame with one column per rule column
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant {variant!r}, expected one of {VARIANTS}")
+
+    rng = np.random.default_rng(seed)
+    dtypes: Dict[str, Any] = VALIDATION_RULES[rule_id]["dtype"]
+    columns = {}
+    for name, dtype in dtypes.items():
+        if variant == "all_dirty":
+            columns[name] = [_invalid_value(dtype)] * rows
+        elif variant == "numeric_codes" and dtype is str:
+            columns[name] = rng.integers(100, 100000, rows).tolist()
+        else:
+            columns[name] = _valid_values(dtype, rows, rng)
+
+    if variant == "dirty":
+        names = list(dtypes)
+        dirty_rows = rng.choice(rows, size=max(1, int(rows * DIRTY_ROW_RATIO)), replace=False)
+        dirty_columns = rng.integers(0, len(names), len(dirty_rows))
+        for row, column in zip(dirty_rows.tolist(), dirty_columns.tolist()):
+            columns[names[column]][row] = _invalid_value(dtypes[names[column]])
+
+    return pd.DataFrame(columns)
+
+
+def write_workbook(df: pd.DataFrame, path: str) -> None:
+    """Write a DataFrame to a single-sheet workbook in openpyxl's write-only mode.
+
+    Like ``DataFrame.to_excel``, the first column holds the row index.
+
+    Args:
+        df: Data to write
+        path: Destination .xlsx path
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append([None] + [str(column) for column in df.columns])
+    for index, row in enumerate(df.itertuples(index=False, name=None)):
+        sheet.append([index, *row])
+    workbook.save(path)
+
+
+def get_workbook(
+    rule_id: str, rows: int, variant: str = "clean", cache_dir: str = DEFAULT_CACHE_DIR
+) -> str:
+    """Return the path of a generated workbook, generating it on first use.
+
+    Args:
+        rule_id: ID of validation rules in config/rules.py
+        rows: Number of data rows
+        variant: "clean", "dirty", "all_dirty" or "numeric_codes"
+        cache_dir: Directory keeping generated workbooks between runs
+
+    Returns:
+        Path of the .xlsx file
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"rule{rule_id}_{rows}_{variant}.xlsx")
+    if not os.path.exists(path):
+        partial = f"{path}.partial"
+        write_workbook(generate_frame(rule_id, rows, variant), partial)
+        os.replace(partial, path)
+    return path
@@ -30,4 +30,43 @@ VALIDATION_RULES: ValidationRule = {
             "Phần Trăm Thuế": float
         }
     }
-}
\ No newline at end of file
+}
+
+# Type alias for validate-and-load target structure
+LoadTarget = Dict[str, Any]
+
+# Tables that validated files are loaded into, keyed by rule ID.
+#   table: target table; the file is COPYed into a temporary table shaped like it
+#   staging: name of that temporary table, read by the procedure
+#   procedure: set-based procedure merging the staged rows into the table,
+#       called with the loading user ID followed by params
+#   params: further procedure arguments
+#   columns: file column -> table column
+#
+# sp_tax_code_ref_load (data/sql/sp_tax_code_ref_load.sql) updates existing
+# codes from the staged columns and creates new ones with the defaults of
+# sp_tax_code_ref_create. Its one extra argument is the tax_rule_rcd given to
+# new codes; with None, files that contain unknown codes are rejected.
+LOAD_TARGETS: Dict[str, LoadTarget] = {
+    "1": {
+        "table": "tax_code_ref",
+        "staging": "tax_code_ref_staging",
+        "procedure": "sp_tax_code_ref_load",
+        "params": [None],
+        "columns": {
+            "Mã thuế": "tax_code_rcd",
+            "Tên thuế": "tax_code_ref_name_l",
+            "Phần trăm thuế": "tax_rate",
+        },
+    },
+    "2": {
+        "table": "tax_code_ref",
+        "staging": "tax_code_ref_staging",
+        "procedure": "sp_tax_code_ref_load",
+        "params": [None],
+        "columns": {
+            "Mã Thuế": "tax_code_rcd",
+            "Phần Trăm Thuế": "tax_rate",
+        },
+    },
+}
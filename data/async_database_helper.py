@@ -0,0 +1,572 @@
+"""Async database helper module for PostgreSQL using psycopg3 AsyncConnection."""
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Tuple, Optional, Dict, Sequence, Union
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from data.database_helper import (
+    ProcedureCall,
+    RowFormat,
+    procedure_call_failed,
+    procedure_call_query,
+    procedure_query,
+    shape_rows,
+)
+from data.prepared_statements import prepared_statements
+from data.query_metrics import pipeline_label, pipeline_seconds, pool_wait_seconds, query_seconds
+from data.procedure_signatures import (
+    PARAM_TYPES_BY_PREFIX_QUERY,
+    PARAM_TYPES_QUERY,
+    procedure_signatures,
+)
+
+
+class AsyncDatabaseHelper:
+    """Async counterpart of DatabaseHelper for use inside the event loop.
+
+    Exposes the same methods as DatabaseHelper as coroutines, so queries
+    wait on the network without blocking other requests. Unless a connection
+    is held, by ``open_connection`` or inside a ``connection()`` block, every
+    call checks out its own connection and releases it afterwards, so one
+    instance can be shared by concurrent requests.
+    """
+
+    _pool: Optional[AsyncConnectionPool] = None
+
+    @classmethod
+    async def initialize_pool(
+        cls, minconn: int, maxconn: int, connection_string: str, timeout: float = 30.0
+    ) -> None:
+        """Open the async connection pool if not already created.
+
+        Must be awaited from a running event loop, e.g. on application startup.
+
+        Args:
+            minconn: Minimum number of connections in the pool
+            maxconn: Maximum number of connections in the pool
+            connection_string: PostgreSQL connection string
+            timeout: Seconds to wait for a free connection before failing
+        """
+        if cls._pool is None:
+            cls._pool = AsyncConnectionPool(
+                connection_string, min_size=minconn, max_size=maxconn, timeout=timeout, open=False
+            )
+            await cls._pool.open()
+
+    def __init__(self, connection_string: str, use_pool: bool = True, prepare_statements: bool = True):
+        """Initialize AsyncDatabaseHelper.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            use_pool: Whether to use connection pooling (True) or direct connections (False)
+            prepare_statements: Whether to prepare stored procedure calls on their first
+                run on a connection, so later calls on it skip parsing and planning;
+                False never prepares, e.g. behind a transaction-pooling PgBouncer
+        """
+        self.connection_string = connection_string
+        self.use_pool = use_pool
+        self.prepare_statements = prepare_statements
+        self.conn: Optional[psycopg.AsyncConnection] = None
+        self._scoped = False
+
+    async def open_connection(self) -> str:
+        """Get a connection from the pool or open a new direct connection.
+
+        Returns:
+            Status message about the connection attempt
+        """
+        if self.conn:
+            return "Connection is already open."
+
+        try:
+            if self.use_pool:
+                if not AsyncDatabaseHelper._pool:
+                    return "Connection pool is not initialized."
+                self.conn = await self._checkout()
+            else:
+                self.conn = await psycopg.AsyncConnection.connect(self.connection_string)
+            return "Connection acquired successfully."
+        except Exception as e:
+            return f"Error acquiring connection: {str(e)}"
+
+    async def get_procedure_param_types(self, procedure_name: str) -> List[str]:
+        """Get parameter types for a stored procedure.
+
+        Served from the shared signature cache; the catalog is only queried
+        on a miss or after the entry expired.
+
+        Args:
+            procedure_name: Name of the stored procedure
+
+        Returns:
+            List of parameter types as strings
+        """
+        cached = procedure_signatures.get(procedure_name)
+        if cached is not None:
+            return cached
+
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn, conn.cursor() as cursor:
+                await cursor.execute(PARAM_TYPES_QUERY, [procedure_name])
+                result = [i[0] for i in await cursor.fetchall()]
+            if result:
+                procedure_signatures.set(procedure_name, result)
+            return result
+        except Exception:
+            return []
+
+    async def load_procedure_signatures(self, prefix: str) -> Dict[str, List[str]]:
+        """Load the signatures of all procedures starting with ``prefix`` in one query.
+
+        Used to warm the cache on startup and to refresh it after migrations.
+
+        Args:
+            prefix: Procedure name prefix, e.g. "sp_tax_code_ref_"
+
+        Returns:
+            Parameter types keyed by procedure name
+        """
+        await self._ensure_connection()
+        async with self._connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(PARAM_TYPES_BY_PREFIX_QUERY, [prefix])
+            signatures = {name: list(types) for name, types in await cursor.fetchall()}
+        procedure_signatures.update(signatures)
+        return signatures
+
+    async def close_connection(self) -> str:
+        """Return connection to pool or close direct connection.
+
+        Returns:
+            Status message about the connection closing attempt
+        """
+        if self.conn:
+            try:
+                if self.use_pool:
+                    await AsyncDatabaseHelper._pool.putconn(self.conn)
+                else:
+                    await self.conn.close()
+                self.conn = None
+                return "Connection closed successfully."
+            except Exception as e:
+                return f"Error closing connection: {str(e)}"
+        return "No active connection to close."
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[None]:
+        """Scope one connection to the block.
+
+        The connection is checked out on the first query inside the block, so
+        a block that never touches the database costs nothing. Every execute_*
+        call inside the block reuses it, and it is returned to the pool (or
+        closed) on exit, even on errors. Meant to wrap one request, with one
+        helper instance per request.
+
+        Raises:
+            psycopg_pool.PoolTimeout: From the first query, if no pooled
+                connection frees up in time
+        """
+        if self.conn or self._scoped:
+            yield
+            return
+
+        self._scoped = True
+        try:
+            yield
+        finally:
+            self._scoped = False
+            await self.close_connection()
+
+    async def _ensure_connection(self) -> None:
+        """Check out the scoped connection before the first statement.
+
+        Outside ``connection()`` this does nothing and each call checks out
+        its own connection. Inside it, checkout errors propagate, so callers
+        can tell an exhausted pool from a failed statement.
+        """
+        if self.conn or not self._scoped:
+            return
+        if self.use_pool:
+            if not AsyncDatabaseHelper._pool:
+                raise RuntimeError("Connection pool is not initialized.")
+            self.conn = await self._checkout()
+        else:
+            self.conn = await psycopg.AsyncConnection.connect(self.connection_string)
+
+    @staticmethod
+    async def _checkout() -> psycopg.AsyncConnection:
+        """Check out a pooled connection, recording how long the checkout waited."""
+        start = time.perf_counter()
+        try:
+            return await AsyncDatabaseHelper._pool.getconn()
+        finally:
+            pool_wait_seconds.labels("async").observe(time.perf_counter() - start)
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        """Yield the open connection, or one checked out just for this call."""
+        if self.conn:
+            try:
+                yield self.conn
+            except Exception:
+                # Leave the shared connection usable for the next call
+                await self.conn.rollback()
+                raise
+        elif self.use_pool:
+            if not AsyncDatabaseHelper._pool:
+                raise RuntimeError("Connection pool is not initialized.")
+            start = time.perf_counter()
+            async with AsyncDatabaseHelper._pool.connection() as conn:
+                pool_wait_seconds.labels("async").observe(time.perf_counter() - start)
+                yield conn
+        else:
+            async with await psycopg.AsyncConnection.connect(self.connection_string) as conn:
+                yield conn
+
+    @staticmethod
+    def _forget_signature(error: Exception, procedure_name: str) -> None:
+        """Forget a cached signature the database no longer accepts."""
+        if isinstance(error, psycopg.errors.UndefinedFunction):
+            procedure_signatures.invalidate(procedure_name)
+
+    async def _execute_procedure(
+        self,
+        cursor: psycopg.AsyncCursor,
+        procedure_name: str,
+        query: str,
+        params: Sequence[Any],
+        pipelined: bool = False,
+    ) -> None:
+        """Execute a procedure call, preparing it as ``prepare_statements`` says.
+
+        The round trip is recorded in ``db_query_seconds``, except for calls
+        queued in a pipeline, which are timed as a batch by the caller.
+        """
+        start = time.perf_counter()
+        try:
+            await cursor.execute(query, params, prepare=self.prepare_statements)
+        except Exception:
+            prepared_statements.forget(cursor.connection, query)
+            raise
+        if not pipelined:
+            query_seconds.labels(procedure_name).observe(time.perf_counter() - start)
+        prepared_statements.record(cursor.connection, procedure_name, query, self.prepare_statements)
+
+    async def execute_non_query(self, query: str) -> str:
+        """Execute a query that doesn't return results (INSERT, UPDATE, DELETE).
+
+        Args:
+            query: SQL query to execute
+
+        Returns:
+            Status message about query execution
+        """
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn, conn.cursor() as cursor:
+                await cursor.execute(query)
+                await conn.commit()
+            return "Query executed successfully."
+        except Exception as e:
+            return f"Error executing query: {str(e)}"
+
+    async def execute_scalar(self, query: str) -> Tuple[Any, str]:
+        """Execute a query that returns a single value.
+
+        Args:
+            query: SQL query to execute
+
+        Returns:
+            Tuple containing (result, error_message)
+        """
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn, conn.cursor() as cursor:
+                await cursor.execute(query)
+                await conn.commit()
+                result = await cursor.fetchone()
+            return (result[0] if result else None, "")
+        except Exception as e:
+            return None, f"Error executing scalar query: {str(e)}"
+
+    async def execute_stored_procedure(self, procedure_name: str, *params: Any) -> str:
+        """Execute a stored procedure with no result.
+
+        Args:
+            procedure_name: Name of the stored procedure
+            params: Parameters to pass to the stored procedure
+
+        Returns:
+            Status message about stored procedure execution
+        """
+        expected_types = await self.get_procedure_param_types(procedure_name)
+        if not expected_types:
+            return f"Could not retrieve parameter types for {procedure_name}"
+
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn, conn.cursor() as cursor:
+                query = procedure_query(procedure_name, tuple(expected_types[:len(params)]), "none")
+                await self._execute_procedure(cursor, procedure_name, query, params)
+                await conn.commit()
+            return "Stored procedure executed successfully."
+        except Exception as e:
+            self._forget_signature(e, procedure_name)
+            return f"Error executing stored procedure: {str(e)}"
+
+    async def execute_scalar_stored_procedure(self, procedure_name: str, *params: Any) -> Tuple[Any, str]:
+        """Execute a stored procedure that returns a single value.
+
+        Args:
+            procedure_name: Name of the stored procedure
+            params: Parameters to pass to the stored procedure
+
+        Returns:
+            Tuple containing (result, error_message)
+        """
+        expected_types = await self.get_procedure_param_types(procedure_name)
+        if not expected_types:
+            return None, f"Could not retrieve parameter types for {procedure_name}"
+
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn, conn.cursor() as cursor:
+                query = procedure_query(procedure_name, tuple(expected_types[:len(params)]), "scalar")
+                await self._execute_procedure(cursor, procedure_name, query, params)
+                await conn.commit()
+                result = await cursor.fetchone()
+            return (result[0] if result else None, "")
+        except Exception as e:
+            self._forget_signature(e, procedure_name)
+            return None, f"Error executing scalar stored procedure: {str(e)}"
+
+    async def execute_scalar_stored_procedure_batch(
+        self, procedure_name: str, params_list: Sequence[Sequence[Any]], batch_size: int = 500
+    ) -> List[Tuple[Any, str]]:
+        """Execute a scalar stored procedure once per parameter row, batch by batch.
+
+        Each batch is sent with a pipelined ``executemany`` and committed as
+        one transaction. If any row of a batch fails, the batch is rolled back
+        and replayed row by row under savepoints, so the valid rows are still
+        committed and every failing row gets its own error.
+
+        Args:
+            procedure_name: Name of the stored procedure
+            params_list: One parameter sequence per call, all of the same length
+            batch_size: Maximum number of rows per transaction
+
+        Returns:
+            One (result, error_message) tuple per row, in input order
+        """
+        if not params_list:
+            return []
+
+        expected_types = await self.get_procedure_param_types(procedure_name)
+        if not expected_types:
+            error = f"Could not retrieve parameter types for {procedure_name}"
+            return [(None, error)] * len(params_list)
+
+        query = procedure_query(procedure_name, tuple(expected_types[:len(params_list[0])]), "scalar")
+        results: List[Tuple[Any, str]] = []
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn:
+                # Close the implicit transaction of the signature lookup, if any
+                await conn.commit()
+                for start in range(0, len(params_list), batch_size):
+                    batch = params_list[start:start + batch_size]
+                    try:
+                        batch_start = time.perf_counter()
+                        results.extend(await self._execute_scalar_batch(conn, query, batch))
+                        pipeline_seconds.labels(procedure_name).observe(time.perf_counter() - batch_start)
+                    except psycopg.Error:
+                        results.extend(await self._execute_scalar_rows(conn, procedure_name, query, batch))
+            return results
+        except Exception as e:
+            self._forget_signature(e, procedure_name)
+            error = f"Error executing scalar stored procedure: {str(e)}"
+            return results + [(None, error)] * (len(params_list) - len(results))
+
+    @staticmethod
+    async def _execute_scalar_batch(
+        conn: psycopg.AsyncConnection, query: str, batch: Sequence[Sequence[Any]]
+    ) -> List[Tuple[Any, str]]:
+        """Run a whole batch in one pipelined transaction; raises on the first failing row."""
+        results = []
+        async with conn.transaction(), conn.pipeline(), conn.cursor() as cursor:
+            await cursor.executemany(query, batch, returning=True)
+            while True:
+                row = await cursor.fetchone()
+                results.append((row[0] if row else None, ""))
+                if not cursor.nextset():
+                    break
+        return results
+
+    async def _execute_scalar_rows(
+        self, conn: psycopg.AsyncConnection, procedure_name: str, query: str, batch: Sequence[Sequence[Any]]
+    ) -> List[Tuple[Any, str]]:
+        """Run a batch row by row under savepoints, collecting per-row errors."""
+        results = []
+        async with conn.transaction(), conn.cursor() as cursor:
+            for params in batch:
+                try:
+                    async with conn.transaction():
+                        await self._execute_procedure(cursor, procedure_name, query, params)
+                        row = await cursor.fetchone()
+                    results.append((row[0] if row else None, ""))
+                except psycopg.Error as e:
+                    results.append((None, f"Error executing scalar stored procedure: {str(e)}"))
+        return results
+
+    async def execute_pipeline(self, calls: Sequence[ProcedureCall]) -> List[Tuple[Any, str]]:
+        """Execute several stored procedure calls in one pipelined round trip.
+
+        All calls are queued on the connection and sent together with the
+        final COMMIT, then their results are collected, so the latency of the
+        link is paid once instead of once per call. The calls share one
+        transaction: if any fails, all are rolled back and every call reports
+        the error.
+
+        Args:
+            calls: Procedure calls to queue, in execution order
+
+        Returns:
+            One (result, error_message) tuple per call, in input order
+        """
+        if not calls:
+            return []
+
+        queries = []
+        for call in calls:
+            expected_types = await self.get_procedure_param_types(call.procedure_name)
+            if not expected_types:
+                error = f"Could not retrieve parameter types for {call.procedure_name}"
+                return [procedure_call_failed(c, error) for c in calls]
+            queries.append(procedure_call_query(call, expected_types))
+
+        cursors = []
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn:
+                # Close the implicit transaction of the signature lookups, if any
+                await conn.commit()
+                start = time.perf_counter()
+                async with conn.pipeline():
+                    for call, query in zip(calls, queries):
+                        cursor = conn.cursor(row_factory=dict_row) if call.returns == "data" else conn.cursor()
+                        cursors.append(cursor)
+                        await self._execute_procedure(
+                            cursor, call.procedure_name, query, call.params, pipelined=True
+                        )
+                    await conn.commit()
+                pipeline_seconds.labels(pipeline_label(call.procedure_name for call in calls)).observe(
+                    time.perf_counter() - start
+                )
+
+                results = []
+                for call, cursor in zip(calls, cursors):
+                    if call.returns == "data":
+                        results.append((await cursor.fetchall(), ""))
+                    elif call.returns == "scalar":
+                        row = await cursor.fetchone()
+                        results.append((row[0] if row else None, ""))
+                    else:
+                        results.append((None, ""))
+                return results
+        except Exception as e:
+            error = f"Error executing pipeline: {str(e)}"
+            return [procedure_call_failed(call, error) for call in calls]
+        finally:
+            for cursor in cursors:
+                await cursor.close()
+
+    async def execute_stored_procedure_return_data(
+        self, procedure_name: str, *params: Any, row_format: RowFormat = "dict"
+    ) -> Tuple[Union[List[Dict[str, Any]], Dict[str, Any]], str]:
+        """Execute a stored procedure that returns a table of data.
+
+        Parameters are cast to the types of the procedure's catalog signature,
+        like the other execute_* methods, so text keys and JSON ID lists reach
+        the procedure with their declared types.
+
+        Args:
+            procedure_name: Name of the stored procedure
+            params: Parameters to pass to the stored procedure
+            row_format: Result layout, see RowFormat
+
+        Returns:
+            Tuple containing (result_set, error_message)
+        """
+        expected_types = await self.get_procedure_param_types(procedure_name)
+        if not expected_types:
+            return [], f"Could not retrieve parameter types for {procedure_name}"
+
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn, conn.cursor(
+                row_factory=dict_row if row_format == "dict" else None
+            ) as cursor:
+                query = procedure_query(procedure_name, tuple(expected_types[:len(params)]))
+                await self._execute_procedure(cursor, procedure_name, query, params)
+                await conn.commit()
+                if row_format == "dict":
+                    return await cursor.fetchall(), ""
+                columns = [column.name for column in cursor.description]
+                return shape_rows(columns, await cursor.fetchall(), row_format), ""
+        except Exception as e:
+            self._forget_signature(e, procedure_name)
+            return [], f"Error executing stored procedure: {str(e)}"
+
+    async def stream_stored_procedure(
+        self, procedure_name: str, *params: Any, batch_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Execute a stored procedure and yield its rows in batches.
+
+        Rows are read through a named server-side cursor, so only one batch is
+        held in memory at a time. The connection stays in a transaction until
+        the generator is exhausted.
+
+        Args:
+            procedure_name: Name of the stored procedure
+            params: Parameters to pass to the stored procedure
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            Lists of up to ``batch_size`` rows
+
+        Raises:
+            RuntimeError: If the parameter types cannot be retrieved
+            psycopg.Error: If the procedure fails; unlike the execute_* methods
+                errors are raised, since rows may already have been consumed
+        """
+        expected_types = await self.get_procedure_param_types(procedure_name)
+        if not expected_types:
+            raise RuntimeError(f"Could not retrieve parameter types for {procedure_name}")
+
+        await self._ensure_connection()
+        try:
+            async with self._connection() as conn:
+                # Server-side cursors are declared, not prepared
+                async with conn.cursor(name=f"{procedure_name}_stream", row_factory=dict_row) as cursor:
+                    await cursor.execute(procedure_query(procedure_name, tuple(expected_types[:len(params)])), params)
+                    while rows := await cursor.fetchmany(batch_size):
+                        yield rows
+                await conn.commit()
+        except Exception as e:
+            self._forget_signature(e, procedure_name)
+            raise
+
+    @classmethod
+    def pool_stats(cls) -> Dict[str, int]:
+        """Return psycopg_pool statistics of the pool, or {} if it is not open."""
+        return cls._pool.get_stats() if cls._pool else {}
+
+    @classmethod
+    async def close_pool(cls) -> None:
+        """Close the entire connection pool."""
+        if cls._pool:
+            await cls._pool.close()
+            cls._pool = None
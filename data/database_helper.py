@@ -232,42 +232,126 @@
 #             cls._pool = None
 
 """Database helper module for PostgreSQL connection management and query execution using psycopg3."""
+import time
+
 import psycopg
+from contextlib import contextmanager
+from functools import lru_cache
+from psycopg import sql
 from psycopg.rows import dict_row
 from psycopg_pool import ConnectionPool
-from typing import Any, List, Tuple, Optional, Dict, Union, TypeVar
+from typing import Any, Iterable, Iterator, List, Literal, NamedTuple, Tuple, Optional, Dict, Sequence, Union, TypeVar
+
+from data.prepared_statements import prepared_statements
+from data.query_metrics import pipeline_label, pipeline_seconds, pool_wait_seconds, query_seconds
+from data.procedure_signatures import (
+    PARAM_TYPES_BY_PREFIX_QUERY,
+    PARAM_TYPES_QUERY,
+    procedure_signatures,
+)
 
 T = TypeVar('T')
 QueryResult = Union[List[Dict[str, Any]], Any, None]
 
 
+class ProcedureCall(NamedTuple):
+    """One stored procedure call queued in a pipeline.
+    
+    ``returns`` picks the result shape, matching the execute_* methods:
+    "none" (execute_stored_procedure), "scalar" (execute_scalar_stored_procedure)
+    or "data" (execute_stored_procedure_return_data).
+    """
+    procedure_name: str
+    params: Sequence[Any] = ()
+    returns: Literal["none", "scalar", "data"] = "data"
+
+
+@lru_cache(maxsize=1024)
+def procedure_query(procedure_name: str, param_types: Tuple[str, ...], returns: str = "data") -> str:
+    """Build the SQL text of a procedure call.
+    
+    Cached, so every call with the same signature sends the same text; psycopg
+    keys prepared statements on it.
+    
+    Args:
+        procedure_name: Name of the stored procedure
+        param_types: Types of the parameters actually passed
+        returns: "none" to select the function value, otherwise select * from it
+        
+    Returns:
+        SQL with one typed placeholder per parameter
+    """
+    param_placeholders = ', '.join(f'%s::{param_type}' for param_type in param_types)
+    if returns == "none":
+        return f"SELECT {procedure_name}({param_placeholders})"
+    return f"SELECT * FROM {procedure_name}({param_placeholders})"
+
+
+def procedure_call_query(call: ProcedureCall, expected_types: List[str]) -> str:
+    """Build the SQL for a queued procedure call."""
+    return procedure_query(call.procedure_name, tuple(expected_types[:len(call.params)]), call.returns)
+
+
+def procedure_call_failed(call: ProcedureCall, error: str) -> Tuple[Any, str]:
+    """Empty result of the right shape for a call that did not run."""
+    return ([] if call.returns == "data" else None), error
+
+
+# Result layout of execute_stored_procedure_return_data: "dict" gives one dict
+# per row; "rows" gives {"columns": names, "rows": tuples} and "columns" gives
+# {"columns": names, "values": one list per column}, which skip building a
+# dict per row and repeat no keys when serialized
+RowFormat = Literal["dict", "rows", "columns"]
+
+
+def shape_rows(
+    columns: List[str], rows: List[Tuple[Any, ...]], row_format: RowFormat
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """Lay out tuple rows and their column names in a RowFormat."""
+    if row_format == "rows":
+        return {"columns": columns, "rows": rows}
+    if row_format == "columns":
+        return {"columns": columns, "values": [list(values) for values in zip(*rows)] if rows else [[] for _ in columns]}
+    return [dict(zip(columns, row)) for row in rows]
+
+
 class DatabaseHelper:
     """Helper class for database operations with connection pooling support."""
     
     _pool = None
     
     @classmethod
-    def initialize_pool(cls, minconn: int, maxconn: int, connection_string: str) -> None:
+    def initialize_pool(
+        cls, minconn: int, maxconn: int, connection_string: str, timeout: float = 30.0
+    ) -> None:
         """Initialize connection pool if not already created.
         
         Args:
             minconn: Minimum number of connections in the pool
             maxconn: Maximum number of connections in the pool
             connection_string: PostgreSQL connection string
+            timeout: Seconds to wait for a free connection before failing
         """
         if cls._pool is None:
-            cls._pool = ConnectionPool(connection_string, min_size=minconn, max_size=maxconn)
+            cls._pool = ConnectionPool(
+                connection_string, min_size=minconn, max_size=maxconn, timeout=timeout
+            )
 
-    def __init__(self, connection_string: str, use_pool: bool = True):
+    def __init__(self, connection_string: str, use_pool: bool = True, prepare_statements: bool = True):
         """Initialize DatabaseHelper.
         
         Args:
             connection_string: PostgreSQL connection string
             use_pool: Whether to use connection pooling (True) or direct connections (False)
+            prepare_statements: Whether to prepare stored procedure calls on their first
+                run on a connection, so later calls on it skip parsing and planning;
+                False never prepares, e.g. behind a transaction-pooling PgBouncer
         """
         self.connection_string = connection_string
         self.use_pool = use_pool
+        self.prepare_statements = prepare_statements
         self.conn: Optional[psycopg.Connection] = None
+        self._scoped = False
     
     def open_connection(self) -> str:
         """Get a connection from the pool or open a new direct connection.
@@ -282,45 +366,156 @@ class DatabaseHelper:
             if self.use_pool:
                 if not DatabaseHelper._pool:
                     return "Connection pool is not initialized."
-                self.conn = DatabaseHelper._pool.getconn()
+                self.conn = self._checkout()
             else:
                 self.conn = psycopg.connect(self.connection_string)
-                print("hehe")
             return "Connection acquired successfully."
         except Exception as e:
             return f"Error acquiring connection: {str(e)}"
     
+    @contextmanager
+    def connection(self) -> Iterator[None]:
+        """Scope one connection to the block.
+        
+        The connection is checked out on the first query inside the block, so
+        a block that never touches the database costs nothing. Every execute_*
+        call inside the block reuses it, and it is returned to the pool (or
+        closed) on exit, even on errors. Meant to wrap one request, with one
+        helper instance per request.
+        
+        Raises:
+            psycopg_pool.PoolTimeout: From the first query, if no pooled
+                connection frees up in time
+        """
+        if self.conn or self._scoped:
+            yield
+            return
+        
+        self._scoped = True
+        try:
+            yield
+        finally:
+            self._scoped = False
+            self.close_connection()
+    
+    def _ensure_connection(self) -> None:
+        """Make sure ``self.conn`` is set before running a statement.
+        
+        Inside ``connection()`` checkout errors propagate, so callers can tell
+        an exhausted pool from a failed statement; outside it the legacy
+        ``open_connection`` behaviour is kept.
+        """
+        if self.conn:
+            return
+        if not self._scoped:
+            self.open_connection()
+        elif self.use_pool:
+            if not DatabaseHelper._pool:
+                raise RuntimeError("Connection pool is not initialized.")
+            self.conn = self._checkout()
+        else:
+            self.conn = psycopg.connect(self.connection_string)
+    
+    @staticmethod
+    def _checkout() -> psycopg.Connection:
+        """Check out a pooled connection, recording how long the checkout waited."""
+        start = time.perf_counter()
+        try:
+            return DatabaseHelper._pool.getconn()
+        finally:
+            pool_wait_seconds.labels("sync").observe(time.perf_counter() - start)
+    
+    def _rollback(self) -> None:
+        """Roll back a failed statement so the connection stays usable."""
+        try:
+            if self.conn:
+                self.conn.rollback()
+        except Exception:
+            pass
+    
+    def _on_error(self, error: Exception, procedure_name: str) -> None:
+        """Roll back, and forget a cached signature the database no longer accepts."""
+        self._rollback()
+        if isinstance(error, psycopg.errors.UndefinedFunction):
+            procedure_signatures.invalidate(procedure_name)
+    
+    def _execute_procedure(
+        self,
+        cursor: psycopg.Cursor,
+        procedure_name: str,
+        query: str,
+        params: Sequence[Any],
+        pipelined: bool = False,
+    ) -> None:
+        """Execute a procedure call, preparing it as ``prepare_statements`` says.
+        
+        The round trip is recorded in ``db_query_seconds``, except for calls
+        queued in a pipeline, which are timed as a batch by the caller.
+        """
+        start = time.perf_counter()
+        try:
+            cursor.execute(query, params, prepare=self.prepare_statements)
+        except Exception:
+            prepared_statements.forget(cursor.connection, query)
+            raise
+        if not pipelined:
+            query_seconds.labels(procedure_name).observe(time.perf_counter() - start)
+        prepared_statements.record(cursor.connection, procedure_name, query, self.prepare_statements)
+    
     def get_procedure_param_types(self, procedure_name: str) -> List[str]:
         """Get parameter types for a stored procedure.
         
+        Served from the shared signature cache; the catalog is only queried
+        on a miss or after the entry expired.
+        
         Args:
             procedure_name: Name of the stored procedure
             
         Returns:
             List of parameter types as strings
         """
-        query = """
-        SELECT t.typname AS param_type
-        FROM pg_proc p
-        JOIN pg_namespace n ON p.pronamespace = n.oid
-        JOIN LATERAL unnest(proargnames, proargtypes::oid[]) 
-            WITH ORDINALITY AS param(param_name, type_oid, ordinality) 
-            ON true
-        JOIN pg_type t ON param.type_oid = t.oid
-        WHERE p.proname = %s
-        ORDER BY param.ordinality;
-        """
+        cached = procedure_signatures.get(procedure_name)
+        if cached is not None:
+            return cached
+        
+        self._ensure_connection()
         try:
-            if not self.conn:
-                self.open_connection()
-                
             with self.conn.cursor() as cursor:
-                cursor.execute(query, [procedure_name])
+                cursor.execute(PARAM_TYPES_QUERY, [procedure_name])
                 result = [i[0] for i in cursor.fetchall()]
-                return result
+            if result:
+                procedure_signatures.set(procedure_name, result)
+            return result
         except Exception:
+            self._rollback()
             return []
 
+    def load_procedure_signatures(self, prefix: str) -> Dict[str, List[str]]:
+        """Load the signatures of all procedures starting with ``prefix`` in one query.
+        
+        Used to warm the cache on startup and to refresh it after migrations.
+        
+        Args:
+            prefix: Procedure name prefix, e.g. "sp_tax_code_ref_"
+            
+        Returns:
+            Parameter types keyed by procedure name
+        """
+        self._ensure_connection()
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute(PARAM_TYPES_BY_PREFIX_QUERY, [prefix])
+                signatures = {name: list(types) for name, types in cursor.fetchall()}
+                self.conn.commit()
+            procedure_signatures.update(signatures)
+            return signatures
+        except Exception:
+            self._rollback()
+            raise
+        finally:
+            if not self.use_pool and not self._scoped:
+                self.close_connection()
+
     def close_connection(self) -> str:
         """Return connection to pool or close direct connection.
         
@@ -348,17 +543,17 @@ class DatabaseHelper:
         Returns:
             Status message about query execution
         """
-        if not self.conn:
-            self.open_connection()
+        self._ensure_connection()
         try:
             with self.conn.cursor() as cursor:
                 cursor.execute(query)
                 self.conn.commit()
             return "Query executed successfully."
         except Exception as e:
+            self._rollback()
             return f"Error executing query: {str(e)}"
         finally:
-            if not self.use_pool:
+            if not self.use_pool and not self._scoped:
                 self.close_connection()
 
     def execute_scalar(self, query: str) -> Tuple[Any, str]:
@@ -370,8 +565,7 @@ class DatabaseHelper:
         Returns:
             Tuple containing (result, error_message)
         """
-        if not self.conn:
-            self.open_connection()
+        self._ensure_connection()
         try:
             with self.conn.cursor() as cursor:
                 cursor.execute(query)
@@ -379,9 +573,10 @@ class DatabaseHelper:
                 result = cursor.fetchone()
             return (result[0] if result else None, "")
         except Exception as e:
+            self._rollback()
             return None, f"Error executing scalar query: {str(e)}"
         finally:
-            if not self.use_pool:
+            if not self.use_pool and not self._scoped:
                 self.close_connection()
 
     def execute_stored_procedure(self, procedure_name: str, *params: Any) -> str:
@@ -398,20 +593,19 @@ class DatabaseHelper:
         if not expected_types:
             return f"Could not retrieve parameter types for {procedure_name}"
         
-        if not self.conn:
-            self.open_connection()
+        self._ensure_connection()
             
         try:
             with self.conn.cursor() as cursor:
-
-                param_placeholders = [f'%s::{expected_types[i]}' for i in range(len(params))]
-                cursor.execute(f"SELECT {procedure_name}({', '.join(param_placeholders)})", params)
+                query = procedure_query(procedure_name, tuple(expected_types[:len(params)]), "none")
+                self._execute_procedure(cursor, procedure_name, query, params)
                 self.conn.commit()
             return "Stored procedure executed successfully."
         except Exception as e:
+            self._on_error(e, procedure_name)
             return f"Error executing stored procedure: {str(e)}"
         finally:
-            if not self.use_pool:
+            if not self.use_pool and not self._scoped:
                 self.close_connection()
 
     def execute_scalar_stored_procedure(self, procedure_name: str, *params: Any) -> Tuple[Any, str]:
@@ -428,30 +622,176 @@ class DatabaseHelper:
         if not expected_types:
             return None, f"Could not retrieve parameter types for {procedure_name}"
         
-        if not self.conn:
-            self.open_connection()
+        self._ensure_connection()
             
         try:
             with self.conn.cursor() as cursor:
-                param_placeholders = [f'%s::{expected_types[i]}' for i in range(len(params))]
-                cursor.execute(f"SELECT * FROM {procedure_name}({', '.join(param_placeholders)})", params)
+                query = procedure_query(procedure_name, tuple(expected_types[:len(params)]), "scalar")
+                self._execute_procedure(cursor, procedure_name, query, params)
                 self.conn.commit()
                 result = cursor.fetchone()
             return (result[0] if result else None, "")
         except Exception as e:
+            self._on_error(e, procedure_name)
             return None, f"Error executing scalar stored procedure: {str(e)}"
         finally:
-            if not self.use_pool:
+            if not self.use_pool and not self._scoped:
+                self.close_connection()
+
+    def execute_scalar_stored_procedure_batch(
+        self, procedure_name: str, params_list: Sequence[Sequence[Any]], batch_size: int = 500
+    ) -> List[Tuple[Any, str]]:
+        """Execute a scalar stored procedure once per parameter row, batch by batch.
+        
+        Each batch is sent with a pipelined ``executemany`` and committed as
+        one transaction. If any row of a batch fails, the batch is rolled back
+        and replayed row by row under savepoints, so the valid rows are still
+        committed and every failing row gets its own error.
+        
+        Args:
+            procedure_name: Name of the stored procedure
+            params_list: One parameter sequence per call, all of the same length
+            batch_size: Maximum number of rows per transaction
+            
+        Returns:
+            One (result, error_message) tuple per row, in input order
+        """
+        if not params_list:
+            return []
+        
+        expected_types = self.get_procedure_param_types(procedure_name)
+        if not expected_types:
+            error = f"Could not retrieve parameter types for {procedure_name}"
+            return [(None, error)] * len(params_list)
+        
+        self._ensure_connection()
+        
+        query = procedure_query(procedure_name, tuple(expected_types[:len(params_list[0])]), "scalar")
+        results: List[Tuple[Any, str]] = []
+        try:
+            # Close the implicit transaction of the signature lookup, if any
+            self.conn.commit()
+            for start in range(0, len(params_list), batch_size):
+                batch = params_list[start:start + batch_size]
+                try:
+                    batch_start = time.perf_counter()
+                    results.extend(self._execute_scalar_batch(query, batch))
+                    pipeline_seconds.labels(procedure_name).observe(time.perf_counter() - batch_start)
+                except psycopg.Error:
+                    results.extend(self._execute_scalar_rows(procedure_name, query, batch))
+            return results
+        except Exception as e:
+            self._on_error(e, procedure_name)
+            error = f"Error executing scalar stored procedure: {str(e)}"
+            return results + [(None, error)] * (len(params_list) - len(results))
+        finally:
+            if not self.use_pool and not self._scoped:
+                self.close_connection()
+    
+    def _execute_scalar_batch(self, query: str, batch: Sequence[Sequence[Any]]) -> List[Tuple[Any, str]]:
+        """Run a whole batch in one pipelined transaction; raises on the first failing row."""
+        results = []
+        with self.conn.transaction(), self.conn.pipeline(), self.conn.cursor() as cursor:
+            cursor.executemany(query, batch, returning=True)
+            while True:
+                row = cursor.fetchone()
+                results.append((row[0] if row else None, ""))
+                if not cursor.nextset():
+                    break
+        return results
+    
+    def _execute_scalar_rows(
+        self, procedure_name: str, query: str, batch: Sequence[Sequence[Any]]
+    ) -> List[Tuple[Any, str]]:
+        """Run a batch row by row under savepoints, collecting per-row errors."""
+        results = []
+        with self.conn.transaction(), self.conn.cursor() as cursor:
+            for params in batch:
+                try:
+                    with self.conn.transaction():
+                        self._execute_procedure(cursor, procedure_name, query, params)
+                        row = cursor.fetchone()
+                    results.append((row[0] if row else None, ""))
+                except psycopg.Error as e:
+                    results.append((None, f"Error executing scalar stored procedure: {str(e)}"))
+        return results
+
+    def execute_pipeline(self, calls: Sequence[ProcedureCall]) -> List[Tuple[Any, str]]:
+        """Execute several stored procedure calls in one pipelined round trip.
+        
+        All calls are queued on the connection and sent together with the
+        final COMMIT, then their results are collected, so the latency of the
+        link is paid once instead of once per call. The calls share one
+        transaction: if any fails, all are rolled back and every call reports
+        the error.
+        
+        Args:
+            calls: Procedure calls to queue, in execution order
+            
+        Returns:
+            One (result, error_message) tuple per call, in input order
+        """
+        if not calls:
+            return []
+        
+        queries = []
+        for call in calls:
+            expected_types = self.get_procedure_param_types(call.procedure_name)
+            if not expected_types:
+                error = f"Could not retrieve parameter types for {call.procedure_name}"
+                return [procedure_call_failed(c, error) for c in calls]
+            queries.append(procedure_call_query(call, expected_types))
+        
+        self._ensure_connection()
+        
+        cursors = []
+        try:
+            # Close the implicit transaction of the signature lookups, if any
+            self.conn.commit()
+            start = time.perf_counter()
+            with self.conn.pipeline():
+                for call, query in zip(calls, queries):
+                    cursor = self.conn.cursor(row_factory=dict_row) if call.returns == "data" else self.conn.cursor()
+                    cursors.append(cursor)
+                    self._execute_procedure(cursor, call.procedure_name, query, call.params, pipelined=True)
+                self.conn.commit()
+            pipeline_seconds.labels(pipeline_label(call.procedure_name for call in calls)).observe(
+                time.perf_counter() - start
+            )
+            
+            results = []
+            for call, cursor in zip(calls, cursors):
+                if call.returns == "data":
+                    results.append((cursor.fetchall(), ""))
+                elif call.returns == "scalar":
+                    row = cursor.fetchone()
+                    results.append((row[0] if row else None, ""))
+                else:
+                    results.append((None, ""))
+            return results
+        except Exception as e:
+            self._rollback()
+            error = f"Error executing pipeline: {str(e)}"
+            return [procedure_call_failed(call, error) for call in calls]
+        finally:
+            for cursor in cursors:
+                cursor.close()
+            if not self.use_pool and not self._scoped:
                 self.close_connection()
 
     def execute_stored_procedure_return_data(
-        self, procedure_name: str, *params: Any
-    ) -> Tuple[List[Dict[str, Any]], str]:
+        self, procedure_name: str, *params: Any, row_format: RowFormat = "dict"
+    ) -> Tuple[Union[List[Dict[str, Any]], Dict[str, Any]], str]:
         """Execute a stored procedure that returns a table of data.
         
+        Parameters are cast to the types of the procedure's catalog signature,
+        like the other execute_* methods, so text keys and JSON ID lists reach
+        the procedure with their declared types.
+        
         Args:
             procedure_name: Name of the stored procedure
             params: Parameters to pass to the stored procedure
+            row_format: Result layout, see RowFormat
             
         Returns:
             Tuple containing (result_set, error_message)
@@ -460,21 +800,134 @@ class DatabaseHelper:
         if not expected_types:
             return [], f"Could not retrieve parameter types for {procedure_name}"
         
-        if not self.conn:
-            self.open_connection()
+        self._ensure_connection()
             
         try:
-            with self.conn.cursor(row_factory=dict_row) as cursor:
-                expected_types = ['integer', 'integer', 'char']
-                param_placeholders = [f'%s::{expected_types[i]}' for i in range(len(params))]
-                cursor.execute(f"SELECT * FROM {procedure_name}({', '.join(param_placeholders)})", params)
+            with self.conn.cursor(row_factory=dict_row if row_format == "dict" else None) as cursor:
+                query = procedure_query(procedure_name, tuple(expected_types[:len(params)]))
+                self._execute_procedure(cursor, procedure_name, query, params)
                 self.conn.commit()
-                return cursor.fetchall(), ""
+                if row_format == "dict":
+                    return cursor.fetchall(), ""
+                columns = [column.name for column in cursor.description]
+                return shape_rows(columns, cursor.fetchall(), row_format), ""
         except Exception as e:
+            self._on_error(e, procedure_name)
             return [], f"Error executing stored procedure: {str(e)}"
         finally:
-            if not self.use_pool:
+            if not self.use_pool and not self._scoped:
+                self.close_connection()
+
+    def stream_stored_procedure(
+        self, procedure_name: str, *params: Any, batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Execute a stored procedure and yield its rows in batches.
+
+        Rows are read through a named server-side cursor, so only one batch is
+        held in memory at a time. The connection stays in a transaction until
+        the generator is exhausted.
+
+        Args:
+            procedure_name: Name of the stored procedure
+            params: Parameters to pass to the stored procedure
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            Lists of up to ``batch_size`` rows
+
+        Raises:
+            RuntimeError: If the parameter types cannot be retrieved
+            psycopg.Error: If the procedure fails; unlike the execute_* methods
+                errors are raised, since rows may already have been consumed
+        """
+        expected_types = self.get_procedure_param_types(procedure_name)
+        if not expected_types:
+            raise RuntimeError(f"Could not retrieve parameter types for {procedure_name}")
+
+        self._ensure_connection()
+
+        try:
+            # Server-side cursors are declared, not prepared
+            with self.conn.cursor(name=f"{procedure_name}_stream", row_factory=dict_row) as cursor:
+                cursor.execute(procedure_query(procedure_name, tuple(expected_types[:len(params)])), params)
+                while rows := cursor.fetchmany(batch_size):
+                    yield rows
+            self.conn.commit()
+        except Exception as e:
+            self._on_error(e, procedure_name)
+            raise
+        finally:
+            if not self.use_pool and not self._scoped:
                 self.close_connection()
+
+    def copy_load(
+        self,
+        table: str,
+        staging: str,
+        columns: Sequence[str],
+        blocks: Iterable[Union[str, bytes]],
+        procedure_name: str,
+        *params: Any,
+    ) -> Tuple[int, str]:
+        """Bulk load CSV data with COPY and merge it with a stored procedure in one transaction.
+        
+        ``blocks`` is streamed with ``COPY FROM STDIN`` into ``staging``, a
+        temporary table shaped like ``table`` plus a ``_row_num`` column that
+        keeps the input order; columns not in ``columns`` stay NULL. The
+        procedure then merges the staged rows into ``table`` set-based, applying
+        the same rules as the single-row procedures. If iterating ``blocks``
+        raises, nothing is merged and the transaction is rolled back.
+        
+        Args:
+            table: Target table name, whose columns the staging table copies
+            staging: Name of the temporary staging table the procedure reads
+            columns: Staged columns, in the order of the CSV fields
+            blocks: CSV text blocks without header; empty fields are NULL
+            procedure_name: Procedure merging the staged rows, returning the
+                number of rows written
+            params: Parameters to pass to the procedure
+            
+        Returns:
+            Tuple containing (number of rows inserted or updated, error_message)
+        """
+        expected_types = self.get_procedure_param_types(procedure_name)
+        if not expected_types:
+            return 0, f"Could not retrieve parameter types for {procedure_name}"
+        
+        staging_table = sql.Identifier(staging)
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        
+        self._ensure_connection()
+        try:
+            # Start from a clean transaction, so the load commits on its own
+            self.conn.commit()
+            with self.conn.transaction(), self.conn.cursor() as cursor:
+                cursor.execute(sql.SQL(
+                    "CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT * FROM {table} WITH NO DATA"
+                ).format(staging=staging_table, table=sql.Identifier(table)))
+                # Remembers the input order, so the last duplicate can win the merge
+                cursor.execute(sql.SQL("ALTER TABLE {} ADD COLUMN _row_num bigserial").format(staging_table))
+                
+                copy_query = sql.SQL("COPY {} ({}) FROM STDIN (FORMAT csv)").format(staging_table, column_list)
+                with cursor.copy(copy_query) as copy:
+                    for block in blocks:
+                        copy.write(block)
+                
+                query = procedure_query(procedure_name, tuple(expected_types[:len(params)]), "none")
+                self._execute_procedure(cursor, procedure_name, query, params)
+                merged = cursor.fetchone()[0]
+            return merged, ""
+        except Exception as e:
+            self._on_error(e, procedure_name)
+            return 0, f"Error loading data into {table}: {str(e)}"
+        finally:
+            if not self.use_pool and not self._scoped:
+                self.close_connection()
+    
+    @classmethod
+    def pool_stats(cls) -> Dict[str, int]:
+        """Return psycopg_pool statistics of the pool, or {} if it is not open."""
+        return cls._pool.get_stats() if cls._pool else {}
     
     @classmethod
     def close_pool(cls) -> None:
@@ -0,0 +1,72 @@
+"""Process-wide counters of stored procedure calls served by prepared statements."""
+import threading
+import weakref
+from typing import Any, Dict, List, Set
+
+
+class PreparedStatementStats:
+    """Tracks which statements each connection has prepared, and hit counts.
+
+    A call is a hit when its SQL text was already prepared on the connection
+    it runs on, so PostgreSQL skips parsing and planning. psycopg keeps the
+    prepared statements themselves; this mirrors its bookkeeping so the hit
+    ratio can be monitored, and forgets connections once they are closed.
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self._prepared: "weakref.WeakKeyDictionary[Any, Set[str]]" = weakref.WeakKeyDictionary()
+        self._counts: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, connection: Any, procedure_name: str, query: str, prepared: bool = True) -> None:
+        """Count one successful call.
+
+        Args:
+            connection: psycopg connection the call ran on
+            procedure_name: Name of the stored procedure
+            query: SQL text of the call
+            prepared: Whether the call was executed with ``prepare=True``
+        """
+        with self._lock:
+            counts = self._counts.setdefault(procedure_name, [0, 0, 0])
+            counts[0] += 1
+            if not prepared:
+                return
+            statements = self._prepared.setdefault(connection, set())
+            if query in statements:
+                counts[2] += 1
+            else:
+                statements.add(query)
+                counts[1] += 1
+
+    def forget(self, connection: Any, query: str) -> None:
+        """Stop assuming a statement is prepared, e.g. after it failed.
+
+        Args:
+            connection: psycopg connection the call ran on
+            query: SQL text of the call
+        """
+        with self._lock:
+            self._prepared.get(connection, set()).discard(query)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return counters per procedure.
+
+        Returns:
+            Dictionary keyed by procedure name with executions, prepares, hits
+            and hit_ratio (hits over executions)
+        """
+        with self._lock:
+            return {
+                procedure_name: {
+                    "executions": executions,
+                    "prepares": prepares,
+                    "hits": hits,
+                    "hit_ratio": hits / executions if executions else 0.0,
+                }
+                for procedure_name, (executions, prepares, hits) in sorted(self._counts.items())
+            }
+
+
+prepared_statements = PreparedStatementStats()
@@ -0,0 +1,110 @@
+"""Process-wide cache of stored procedure parameter type signatures."""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.config import PROCEDURE_SIGNATURE_TTL
+
+# Catalog lookup for one procedure, in declaration order
+PARAM_TYPES_QUERY = """
+SELECT t.typname AS param_type
+FROM pg_proc p
+JOIN pg_namespace n ON p.pronamespace = n.oid
+JOIN LATERAL unnest(proargnames, proargtypes::oid[])
+    WITH ORDINALITY AS param(param_name, type_oid, ordinality)
+    ON true
+JOIN pg_type t ON param.type_oid = t.oid
+WHERE p.proname = %s
+ORDER BY param.ordinality;
+"""
+
+# Same lookup for every procedure whose name starts with a prefix, one row each
+PARAM_TYPES_BY_PREFIX_QUERY = """
+SELECT p.proname AS procedure_name,
+       array_agg(t.typname::text ORDER BY param.ordinality) AS param_types
+FROM pg_proc p
+JOIN pg_namespace n ON p.pronamespace = n.oid
+JOIN LATERAL unnest(proargnames, proargtypes::oid[])
+    WITH ORDINALITY AS param(param_name, type_oid, ordinality)
+    ON true
+JOIN pg_type t ON param.type_oid = t.oid
+WHERE starts_with(p.proname::text, %s)
+GROUP BY p.proname;
+"""
+
+
+class ProcedureSignatureCache:
+    """Thread-safe map of procedure name to parameter types, with a TTL.
+
+    Shared by every DatabaseHelper and AsyncDatabaseHelper instance so the
+    catalog is queried once per procedure instead of once per call. Entries
+    expire after ``ttl`` seconds; call ``invalidate`` or reload them after a
+    migration changes a signature.
+    """
+
+    def __init__(self, ttl: Optional[float] = 300.0):
+        """Initialize an empty cache.
+
+        Args:
+            ttl: Seconds an entry stays valid, or None to keep entries until invalidated
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[Tuple[str, ...], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, procedure_name: str) -> Optional[List[str]]:
+        """Return cached parameter types, or None if missing or expired.
+
+        Args:
+            procedure_name: Name of the stored procedure
+
+        Returns:
+            List of parameter types, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(procedure_name)
+            if entry is None:
+                return None
+            param_types, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[procedure_name]
+                return None
+            return list(param_types)
+
+    def set(self, procedure_name: str, param_types: List[str]) -> None:
+        """Store parameter types for a procedure.
+
+        Args:
+            procedure_name: Name of the stored procedure
+            param_types: Parameter types in declaration order
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._entries[procedure_name] = (tuple(param_types), expires_at)
+
+    def update(self, signatures: Dict[str, List[str]]) -> None:
+        """Store several signatures at once.
+
+        Args:
+            signatures: Parameter types keyed by procedure name
+        """
+        for procedure_name, param_types in signatures.items():
+            self.set(procedure_name, param_types)
+
+    def invalidate(self, procedure_name: Optional[str] = None) -> None:
+        """Drop one entry, or every entry when no name is given.
+
+        Args:
+            procedure_name: Name of the stored procedure, or None for all
+        """
+        with self._lock:
+            if procedure_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(procedure_name, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+procedure_signatures = ProcedureSignatureCache(ttl=PROCEDURE_SIGNATURE_TTL)
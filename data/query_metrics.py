@@ -0,0 +1,73 @@
+"""Prometheus metrics for stored procedure calls and connection pools."""
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+# Seconds, 1 ms to 30 s
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+query_seconds = Histogram(
+    "db_query_seconds", "Round trip time of one stored procedure call",
+    ["procedure"], buckets=QUERY_BUCKETS
+)
+pipeline_seconds = Histogram(
+    "db_pipeline_seconds", "Round trip time of a pipelined batch of stored procedure calls",
+    ["procedure"], buckets=QUERY_BUCKETS
+)
+pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting to check out a pooled connection",
+    ["pool"], buckets=QUERY_BUCKETS
+)
+
+# psycopg_pool statistics exposed as gauges: stats key -> (metric name, help)
+POOL_GAUGES = {
+    "pool_max": ("db_pool_max_size", "Maximum number of connections in the pool"),
+    "pool_size": ("db_pool_size", "Connections currently open, idle or checked out"),
+    "pool_available": ("db_pool_available", "Idle connections ready to be checked out"),
+    "requests_waiting": ("db_pool_requests_waiting", "Requests waiting for a connection"),
+}
+
+
+class PoolStatsCollector:
+    """Reads pool statistics when metrics are scraped, so the gauges are never stale."""
+
+    def __init__(self):
+        """Initialize without any tracked pools."""
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def track(self, name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """Expose the statistics of a pool.
+
+        Args:
+            name: Value of the ``pool`` label
+            stats: Returns ``get_stats()`` of the pool, or {} while it is closed
+        """
+        self._sources[name] = stats
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        """Let the registry check metric names without reading any pool."""
+        return iter(())
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        """Build one gauge family per statistic, labelled by pool."""
+        families = {
+            key: GaugeMetricFamily(metric, documentation, labels=["pool"])
+            for key, (metric, documentation) in POOL_GAUGES.items()
+        }
+        for name, stats in self._sources.items():
+            values = stats()
+            for key, family in families.items():
+                if key in values:
+                    family.add_metric([name], values[key])
+        return iter(families.values())
+
+
+pool_metrics = PoolStatsCollector()
+REGISTRY.register(pool_metrics)
+
+
+def pipeline_label(procedure_names: Iterable[str]) -> str:
+    """Label a pipelined batch by its procedure, or "mixed" if it runs several."""
+    names = set(procedure_names)
+    return names.pop() if len(names) == 1 else "mixed"
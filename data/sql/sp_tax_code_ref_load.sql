@@ -0,0 +1,84 @@
+-- Set-based load of validated Excel rows into tax_code_ref, called by
+-- POST /api/v1/validate/{rule_id}/load (see LOAD_TARGETS in config/rules.py).
+--
+-- The API COPYs the file into tax_code_ref_staging, a temporary table shaped
+-- like tax_code_ref plus a _row_num column holding the file order; columns
+-- the file does not provide are NULL. This procedure applies the staged rows
+-- in the loading transaction, following sp_tax_code_ref_create and
+-- sp_tax_code_ref_update:
+--   * a code that occurs more than once takes its last row
+--   * existing codes are updated from the columns the file provides; the
+--     others, created_by_user_id included, keep their values, and
+--     lu_user_id / lu_updated record the load
+--   * new codes get every column sp_tax_code_ref_create sets:
+--     tax_code_ref_name_e and tax_code_ref_name_l fall back to each other,
+--     tax_rule_rcd to p_tax_rule_rcd, seq_num continues after the highest
+--     existing one in file order, both flags default to false and status
+--     to 1 (active)
+--   * a new code without a tax_rule_rcd or a name raises, rolling back the
+--     whole load
+-- tax_code_ref is locked against concurrent writes while the load runs, so
+-- codes are matched without relying on a unique constraint.
+--
+-- Returns the number of rows created or updated.
+
+CREATE OR REPLACE FUNCTION sp_tax_code_ref_load(p_loaded_by varchar, p_tax_rule_rcd varchar)
+RETURNS bigint LANGUAGE plpgsql AS $$
+DECLARE
+    updated_count bigint;
+    created_count bigint;
+    incomplete_code varchar;
+BEGIN
+    LOCK TABLE tax_code_ref IN SHARE ROW EXCLUSIVE MODE;
+
+    DELETE FROM tax_code_ref_staging s
+    USING tax_code_ref_staging later
+    WHERE later.tax_code_rcd = s.tax_code_rcd AND later._row_num > s._row_num;
+
+    SELECT s.tax_code_rcd INTO incomplete_code
+    FROM tax_code_ref_staging s
+    WHERE NOT EXISTS (SELECT 1 FROM tax_code_ref t WHERE t.tax_code_rcd = s.tax_code_rcd)
+      AND (coalesce(s.tax_rule_rcd, p_tax_rule_rcd) IS NULL
+           OR coalesce(s.tax_code_ref_name_e, s.tax_code_ref_name_l) IS NULL)
+    ORDER BY s._row_num
+    LIMIT 1;
+    IF incomplete_code IS NOT NULL THEN
+        RAISE EXCEPTION 'Tax code % does not exist and the file gives no tax_rule_rcd or name to create it',
+            incomplete_code;
+    END IF;
+
+    UPDATE tax_code_ref t SET
+        tax_rule_rcd = coalesce(s.tax_rule_rcd, t.tax_rule_rcd),
+        tax_code_ref_name_e = coalesce(s.tax_code_ref_name_e, t.tax_code_ref_name_e),
+        tax_code_ref_name_l = coalesce(s.tax_code_ref_name_l, t.tax_code_ref_name_l),
+        seq_num = coalesce(s.seq_num, t.seq_num),
+        must_not_change_flag = coalesce(s.must_not_change_flag, t.must_not_change_flag),
+        user_defined_rate_flag = coalesce(s.user_defined_rate_flag, t.user_defined_rate_flag),
+        tax_rate = coalesce(s.tax_rate, t.tax_rate),
+        status = coalesce(s.status, t.status),
+        lu_user_id = p_loaded_by,
+        lu_updated = now()
+    FROM tax_code_ref_staging s
+    WHERE t.tax_code_rcd = s.tax_code_rcd;
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+
+    INSERT INTO tax_code_ref (tax_code_rcd, tax_rule_rcd, tax_code_ref_name_e, tax_code_ref_name_l,
+        seq_num, must_not_change_flag, user_defined_rate_flag, tax_rate, status, created_by_user_id, lu_user_id)
+    SELECT s.tax_code_rcd,
+           coalesce(s.tax_rule_rcd, p_tax_rule_rcd),
+           coalesce(s.tax_code_ref_name_e, s.tax_code_ref_name_l),
+           coalesce(s.tax_code_ref_name_l, s.tax_code_ref_name_e),
+           coalesce(s.seq_num, (SELECT coalesce(max(seq_num), 0) FROM tax_code_ref)
+                               + row_number() OVER (ORDER BY s._row_num)),
+           coalesce(s.must_not_change_flag, false),
+           coalesce(s.user_defined_rate_flag, false),
+           s.tax_rate,
+           coalesce(s.status, 1),
+           p_loaded_by,
+           p_loaded_by
+    FROM tax_code_ref_staging s
+    WHERE NOT EXISTS (SELECT 1 FROM tax_code_ref t WHERE t.tax_code_rcd = s.tax_code_rcd);
+    GET DIAGNOSTICS created_count = ROW_COUNT;
+
+    RETURN updated_count + created_count;
+END $$;
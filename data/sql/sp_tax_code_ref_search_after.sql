@@ -0,0 +1,39 @@
+-- Keyset-paginated variant of sp_tax_code_ref_search.
+--
+-- Returns the same columns as sp_tax_code_ref_search, in the same order
+-- (seq_num, then tax_code_rcd as tiebreaker, NULL seq_num last), so clients
+-- can switch between offset and cursor pages transparently; keep the two
+-- ORDER BY clauses in step. total_count is always NULL, since counting
+-- would scan every matching row.
+--
+-- Returns up to p_limit rows after the row (p_after_seq_num,
+-- p_after_tax_code_rcd), or from the start when p_after_tax_code_rcd is
+-- NULL. The position comes from an index on (seq_num, tax_code_rcd) instead
+-- of OFFSET, so every page costs the same however deep the client scrolls.
+-- Filters behave as in sp_tax_code_ref_search.
+
+DROP FUNCTION IF EXISTS sp_tax_code_ref_search_after(varchar, integer, varchar, varchar, varchar, varchar);
+
+CREATE INDEX IF NOT EXISTS tax_code_ref_seq_num_tax_code_rcd_idx ON tax_code_ref (seq_num, tax_code_rcd);
+
+CREATE OR REPLACE FUNCTION sp_tax_code_ref_search_after(
+    p_after_seq_num integer, p_after_tax_code_rcd varchar, p_limit integer, p_lang varchar,
+    p_tax_code_rcd varchar, p_tax_rule_rcd varchar, p_tax_code_ref_name varchar
+) RETURNS TABLE (tax_code_rcd varchar, tax_rule_rcd varchar, tax_code_ref_name varchar,
+                 tax_rate numeric, seq_num integer, status integer, total_count bigint)
+LANGUAGE sql STABLE AS $$
+    SELECT t.tax_code_rcd, t.tax_rule_rcd,
+           CASE WHEN p_lang = 'e' THEN t.tax_code_ref_name_e ELSE t.tax_code_ref_name_l END,
+           t.tax_rate, t.seq_num, t.status, NULL::bigint
+    FROM tax_code_ref t
+    WHERE (p_after_tax_code_rcd IS NULL
+           OR (p_after_seq_num IS NULL AND t.seq_num IS NULL AND t.tax_code_rcd > p_after_tax_code_rcd)
+           OR (p_after_seq_num IS NOT NULL
+               AND (t.seq_num IS NULL OR (t.seq_num, t.tax_code_rcd) > (p_after_seq_num, p_after_tax_code_rcd))))
+      AND (coalesce(p_tax_code_rcd, '') = '' OR t.tax_code_rcd ILIKE '%' || p_tax_code_rcd || '%')
+      AND (coalesce(p_tax_rule_rcd, '') = '' OR t.tax_rule_rcd = p_tax_rule_rcd)
+      AND (coalesce(p_tax_code_ref_name, '') = '' OR t.tax_code_ref_name_e ILIKE '%' || p_tax_code_ref_name || '%'
+           OR t.tax_code_ref_name_l ILIKE '%' || p_tax_code_ref_name || '%')
+    ORDER BY t.seq_num, t.tax_code_rcd
+    LIMIT p_limit;
+$$;
@@ -0,0 +1,64 @@
+-- Notify listeners when tax_code_ref rows change, so every API worker can
+-- evict the affected entries from its in-process lookup cache.
+--
+-- Statement-level triggers send one notification per statement, listing the
+-- changed tax_code_rcd values; large statements (bulk loads) send
+-- {"all": true} instead, which stays well under the 8000 byte payload limit.
+--
+-- The same triggers bump tax_code_ref_version, a single-row change counter
+-- the API uses as the ETag of tax read endpoints. It is updated in the
+-- writing transaction, so it never changes before the data is visible.
+
+CREATE TABLE IF NOT EXISTS tax_code_ref_version (
+    id boolean PRIMARY KEY DEFAULT true CHECK (id),
+    version bigint NOT NULL DEFAULT 0
+);
+INSERT INTO tax_code_ref_version (id, version) VALUES (true, 0) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION notify_tax_code_ref_changed() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    changed_keys json;
+    changed_count integer;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT count(*), json_agg(DISTINCT tax_code_rcd) INTO changed_count, changed_keys FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT count(*), json_agg(DISTINCT tax_code_rcd) INTO changed_count, changed_keys FROM old_rows;
+    ELSE
+        -- Updates may change the key itself, so evict old and new keys
+        SELECT count(*), json_agg(DISTINCT tax_code_rcd) INTO changed_count, changed_keys
+        FROM (SELECT tax_code_rcd FROM old_rows UNION ALL SELECT tax_code_rcd FROM new_rows) AS changed;
+    END IF;
+
+    IF changed_count = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    UPDATE tax_code_ref_version SET version = version + 1;
+
+    IF changed_count > 200 THEN
+        PERFORM pg_notify('tax_code_ref_changed', json_build_object('op', TG_OP, 'all', true)::text);
+    ELSE
+        PERFORM pg_notify('tax_code_ref_changed', json_build_object('op', TG_OP, 'keys', changed_keys)::text);
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS tax_code_ref_notify_insert ON tax_code_ref;
+CREATE TRIGGER tax_code_ref_notify_insert
+    AFTER INSERT ON tax_code_ref
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_tax_code_ref_changed();
+
+DROP TRIGGER IF EXISTS tax_code_ref_notify_update ON tax_code_ref;
+CREATE TRIGGER tax_code_ref_notify_update
+    AFTER UPDATE ON tax_code_ref
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_tax_code_ref_changed();
+
+DROP TRIGGER IF EXISTS tax_code_ref_notify_delete ON tax_code_ref;
+CREATE TRIGGER tax_code_ref_notify_delete
+    AFTER DELETE ON tax_code_ref
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_tax_code_ref_changed();
@@ -0,0 +1,94 @@
+-- Stand-in for the tax_code_ref table and its sp_tax_code_ref_* procedures,
+-- for running the API against a local PostgreSQL (e.g. the load test in
+-- benchmarks/load_test_tax.py) without a copy of the production database.
+--
+-- Signatures and result columns match what routers/tax_router.py calls;
+-- the bodies are plain SQL/PL/pgSQL, not the production implementations.
+-- Apply sp_tax_code_ref_search_after.sql, sp_tax_code_ref_load.sql and
+-- tax_code_ref_notify.sql after this file for keyset search, validate-and-load,
+-- cache invalidation and ETags.
+
+CREATE TABLE IF NOT EXISTS tax_code_ref (
+    tax_code_rcd varchar(50) PRIMARY KEY,
+    tax_rule_rcd varchar(50),
+    tax_code_ref_name_e varchar(255),
+    tax_code_ref_name_l varchar(255),
+    seq_num integer,
+    must_not_change_flag boolean DEFAULT false,
+    user_defined_rate_flag boolean DEFAULT false,
+    tax_rate numeric,
+    status integer DEFAULT 1,
+    created_by_user_id varchar(50),
+    lu_user_id varchar(50),
+    lu_updated timestamptz DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION sp_tax_code_ref_create(
+    p_tax_code_rcd varchar, p_tax_rule_rcd varchar, p_tax_code_ref_name_e varchar,
+    p_tax_code_ref_name_l varchar, p_seq_num integer, p_must_not_change_flag boolean,
+    p_user_defined_rate_flag boolean, p_created_by_user_id varchar, p_tax_rate numeric
+) RETURNS text LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tax_code_ref (tax_code_rcd, tax_rule_rcd, tax_code_ref_name_e, tax_code_ref_name_l,
+        seq_num, must_not_change_flag, user_defined_rate_flag, tax_rate, created_by_user_id, lu_user_id)
+    VALUES (p_tax_code_rcd, p_tax_rule_rcd, p_tax_code_ref_name_e, p_tax_code_ref_name_l,
+        p_seq_num, p_must_not_change_flag, p_user_defined_rate_flag, p_tax_rate, p_created_by_user_id, p_created_by_user_id);
+    RETURN p_tax_code_rcd;
+END $$;
+
+CREATE OR REPLACE FUNCTION sp_tax_code_ref_update(
+    p_tax_code_rcd varchar, p_tax_rule_rcd varchar, p_tax_code_ref_name_e varchar,
+    p_tax_code_ref_name_l varchar, p_seq_num integer, p_must_not_change_flag boolean,
+    p_user_defined_rate_flag boolean, p_lu_user_id varchar, p_tax_rate numeric, p_status integer
+) RETURNS text LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tax_code_ref SET tax_rule_rcd = p_tax_rule_rcd, tax_code_ref_name_e = p_tax_code_ref_name_e,
+        tax_code_ref_name_l = p_tax_code_ref_name_l, seq_num = p_seq_num,
+        must_not_change_flag = p_must_not_change_flag, user_defined_rate_flag = p_user_defined_rate_flag,
+        lu_user_id = p_lu_user_id, tax_rate = p_tax_rate, status = p_status, lu_updated = now()
+    WHERE tax_code_rcd = p_tax_code_rcd;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Tax code % not found', p_tax_code_rcd;
+    END IF;
+    RETURN p_tax_code_rcd;
+END $$;
+
+CREATE OR REPLACE FUNCTION sp_tax_code_ref_delete_multi(p_json_list_id json, p_updated_by varchar)
+RETURNS TABLE (tax_code_rcd varchar) LANGUAGE sql AS $$
+    DELETE FROM tax_code_ref t
+    WHERE t.tax_code_rcd IN (SELECT json_array_elements_text(p_json_list_id))
+    RETURNING t.tax_code_rcd;
+$$;
+
+CREATE OR REPLACE FUNCTION sp_tax_code_ref_get_by_id(p_tax_code_rcd varchar)
+RETURNS SETOF tax_code_ref LANGUAGE sql STABLE AS $$
+    SELECT * FROM tax_code_ref WHERE tax_code_rcd = p_tax_code_rcd;
+$$;
+
+CREATE OR REPLACE FUNCTION sp_tax_code_ref_get_list_dropdown(p_lang varchar)
+RETURNS TABLE (tax_code_rcd varchar, tax_code_ref_name varchar, tax_rate numeric)
+LANGUAGE sql STABLE AS $$
+    SELECT t.tax_code_rcd,
+           CASE WHEN p_lang = 'e' THEN t.tax_code_ref_name_e ELSE t.tax_code_ref_name_l END,
+           t.tax_rate
+    FROM tax_code_ref t WHERE t.status = 1 ORDER BY t.seq_num, t.tax_code_rcd;
+$$;
+
+CREATE OR REPLACE FUNCTION sp_tax_code_ref_search(
+    p_page_index integer, p_page_size integer, p_lang varchar,
+    p_tax_code_rcd varchar, p_tax_rule_rcd varchar, p_tax_code_ref_name varchar
+) RETURNS TABLE (tax_code_rcd varchar, tax_rule_rcd varchar, tax_code_ref_name varchar,
+                 tax_rate numeric, seq_num integer, status integer, total_count bigint)
+LANGUAGE sql STABLE AS $$
+    SELECT t.tax_code_rcd, t.tax_rule_rcd,
+           CASE WHEN p_lang = 'e' THEN t.tax_code_ref_name_e ELSE t.tax_code_ref_name_l END,
+           t.tax_rate, t.seq_num, t.status, count(*) OVER ()
+    FROM tax_code_ref t
+    WHERE (coalesce(p_tax_code_rcd, '') = '' OR t.tax_code_rcd ILIKE '%' || p_tax_code_rcd || '%')
+      AND (coalesce(p_tax_rule_rcd, '') = '' OR t.tax_rule_rcd = p_tax_rule_rcd)
+      AND (coalesce(p_tax_code_ref_name, '') = '' OR t.tax_code_ref_name_e ILIKE '%' || p_tax_code_ref_name || '%'
+           OR t.tax_code_ref_name_l ILIKE '%' || p_tax_code_ref_name || '%')
+    -- Same order as sp_tax_code_ref_search_after, whose cursors seek on it
+    ORDER BY t.seq_num, t.tax_code_rcd
+    OFFSET (greatest(p_page_index, 1) - 1) * p_page_size LIMIT p_page_size;
+$$;
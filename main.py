@@ -1,10 +1,23 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from routers.tax_router import router as tax_router
-from routers.validation_router import router as validation_router
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from config.config import METRICS_ENABLED
+from routers.tax_router import router as tax_router, open_database, close_database
+from routers.validation_router import router as validation_router, validation_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_database()
+    yield
+    validation_executor.shutdown()
+    await close_database()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,5 +30,10 @@ app.add_middleware(
 app.include_router(tax_router)
 app.include_router(validation_router)
 
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 if __name__ == "__main__":
     uvicorn.run("main:app", port=8022, reload=True, host="0.0.0.0")
\ No newline at end of file
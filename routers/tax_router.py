@@ -1,12 +1,51 @@
 """FastAPI router for tax-related endpoints."""
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List, Dict, Any, Optional
+import csv
+import io
+import json
+import logging
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response, status
+from fastapi.concurrency import contextmanager_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Iterator, List, Dict, Any, Literal, Optional, Tuple
 from pydantic import BaseModel
+from psycopg_pool import PoolTimeout
 
-from data.database_helper import DatabaseHelper
-from services.tax_service import create_tax_service, TaxService
+from data.database_helper import DatabaseHelper, RowFormat
+from data.async_database_helper import AsyncDatabaseHelper
+from data.prepared_statements import prepared_statements
+from data.query_metrics import pool_metrics
+from data.procedure_signatures import procedure_signatures
+from services.notification_listener import NotificationListener
+from services.tax_service import create_tax_service, evict_tax_code_refs, tax_lookup_cache, TaxService
 from schemas.tax import TaxCreate, TaxUpdate, TaxDelete, TaxSearch
-from config.config import DATABASE_URL, MAX_CONN, MIN_CONN, USE_POOL
+from config.config import (
+    DATABASE_URL, MAX_CONN, MIN_CONN, POOL_TIMEOUT, USE_ASYNC_DB, USE_POOL,
+    PROCEDURE_SIGNATURE_PREFIX, PROCEDURE_SIGNATURE_WARMUP, PREPARE_STORED_PROCEDURES,
+    TAX_BULK_BATCH_SIZE, TAX_BULK_MAX_BATCH_SIZE, TAX_LOOKUP_MAX_IDS,
+    TAX_CACHE_LISTEN, TAX_CACHE_NOTIFY_CHANNEL, TAX_HTTP_CACHE_CONTROL, EXPORT_FETCH_SIZE
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+pool_metrics.track("sync", DatabaseHelper.pool_stats)
+pool_metrics.track("async", AsyncDatabaseHelper.pool_stats)
+
+# Evicts cached lookups when any worker (or any other client) changes tax_code_ref
+tax_change_listener = NotificationListener(
+    DATABASE_URL,
+    TAX_CACHE_NOTIFY_CHANNEL,
+    on_notify=evict_tax_code_refs,
+    on_reconnect=tax_lookup_cache.invalidate,
+)
+
+
+ROW_FORMAT_DESCRIPTION = (
+    '"dict": one object per row; "rows": {"columns": [...], "rows": [[...], ...]}; '
+    '"columns": {"columns": [...], "values": [[...per column], ...]}. The last two '
+    'skip per-row key objects and are cheaper to build and serialize.'
+)
 
 
 # Response models for better API documentation
@@ -22,16 +61,153 @@ class ErrorResponse(BaseModel):
     detail: str
 
 
-# Initialize database helper
-db_helper = DatabaseHelper(connection_string=DATABASE_URL, use_pool=USE_POOL)
-if USE_POOL:
-    db_helper.initialize_pool(MIN_CONN, MAX_CONN, DATABASE_URL)
+class BulkRowError(BaseModel):
+    """Error for one row of a bulk request."""
+    index: int
+    tax_code_rcd: str
+    error: str
+
 
+class BulkResult(BaseModel):
+    """Outcome of a bulk create or update."""
+    succeeded: int
+    failed: int
+    errors: List[BulkRowError]
+
+
+class BulkResponse(BaseModel):
+    """Response model for bulk endpoints."""
+    message: str
+    result: BulkResult
 
-# Dependency for getting TaxService
-def get_tax_service() -> TaxService:
-    """Dependency to provide TaxService instance."""
-    return create_tax_service(db_helper)
+
+async def open_database() -> None:
+    """Open the connection pool, warm the signature cache and start the cache
+    invalidation listener; called on application startup."""
+    if USE_POOL:
+        if USE_ASYNC_DB:
+            await AsyncDatabaseHelper.initialize_pool(MIN_CONN, MAX_CONN, DATABASE_URL, POOL_TIMEOUT)
+        else:
+            DatabaseHelper.initialize_pool(MIN_CONN, MAX_CONN, DATABASE_URL, POOL_TIMEOUT)
+    
+    if PROCEDURE_SIGNATURE_WARMUP:
+        try:
+            signatures = await refresh_procedure_signatures()
+            logger.info(f"Cached signatures of {len(signatures)} stored procedures")
+        except Exception as e:
+            # Signatures are still looked up lazily on first use
+            logger.warning(f"Could not warm the procedure signature cache: {str(e)}")
+    
+    if TAX_CACHE_LISTEN:
+        tax_change_listener.start()
+
+
+async def refresh_procedure_signatures() -> Dict[str, List[str]]:
+    """Reload the tax stored procedure signatures from the catalog.
+    
+    Drops every cached signature first, so procedures that were removed or
+    changed by a migration are looked up again.
+    
+    Returns:
+        Parameter types keyed by procedure name
+    """
+    procedure_signatures.invalidate()
+    if USE_ASYNC_DB:
+        db_helper = AsyncDatabaseHelper(
+            connection_string=DATABASE_URL, use_pool=USE_POOL, prepare_statements=PREPARE_STORED_PROCEDURES
+        )
+        return await db_helper.load_procedure_signatures(PROCEDURE_SIGNATURE_PREFIX)
+    
+    def load() -> Dict[str, List[str]]:
+        db_helper = DatabaseHelper(
+            connection_string=DATABASE_URL, use_pool=USE_POOL, prepare_statements=PREPARE_STORED_PROCEDURES
+        )
+        with db_helper.connection():
+            return db_helper.load_procedure_signatures(PROCEDURE_SIGNATURE_PREFIX)
+    
+    return await run_in_threadpool(load)
+
+
+async def close_database() -> None:
+    """Stop the cache invalidation listener and close the connection pool; called on application shutdown."""
+    await tax_change_listener.stop()
+    if USE_ASYNC_DB:
+        await AsyncDatabaseHelper.close_pool()
+    else:
+        DatabaseHelper.close_pool()
+
+
+def _pool_exhausted(error: PoolTimeout) -> HTTPException:
+    """Map a pool checkout timeout to 503 so clients back off and retry."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"No database connection available: {str(error)}",
+        headers={"Retry-After": "1"}
+    )
+
+
+# Dependencies for getting TaxService; each request checks out one connection on
+# its first query (none if served from cache), uses it for all of its queries and
+# releases it when the response is done
+async def get_async_tax_service() -> AsyncIterator[TaxService]:
+    """Dependency to provide a TaxService bound to one async connection."""
+    db_helper = AsyncDatabaseHelper(
+        connection_string=DATABASE_URL, use_pool=USE_POOL, prepare_statements=PREPARE_STORED_PROCEDURES
+    )
+    try:
+        async with db_helper.connection():
+            yield create_tax_service(db_helper)
+    except PoolTimeout as e:
+        raise _pool_exhausted(e)
+
+
+def get_sync_tax_service() -> Iterator[TaxService]:
+    """Dependency to provide a TaxService bound to one sync connection."""
+    db_helper = DatabaseHelper(
+        connection_string=DATABASE_URL, use_pool=USE_POOL, prepare_statements=PREPARE_STORED_PROCEDURES
+    )
+    try:
+        with db_helper.connection():
+            yield create_tax_service(db_helper)
+    except PoolTimeout as e:
+        raise _pool_exhausted(e)
+
+
+get_tax_service = get_async_tax_service if USE_ASYNC_DB else get_sync_tax_service
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+async def check_not_modified(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    tax_service: TaxService = Depends(get_tax_service)
+) -> Optional[Response]:
+    """Dependency for conditional GET on tax read endpoints.
+    
+    The ETag is the table's change counter, so a revalidation costs one
+    cached or single-row lookup instead of the stored procedure; the counter
+    is re-read at least every TAX_VERSION_TTL seconds. Sets ETag and
+    Cache-Control on the response.
+    
+    Returns:
+        A 304 response if the client's copy is current, otherwise None
+    """
+    version, error = await tax_service.get_data_version()
+    if error:
+        # Version table not installed or unreadable; serve without an ETag.
+        # The tracker logs the failure once and retries after TAX_VERSION_RETRY
+        return None
+    
+    headers = {"ETag": f'"tax-{version}"', "Cache-Control": TAX_HTTP_CACHE_CONTROL}
+    response.headers.update(headers)
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
 
 
 # Create router with prefix and tags for better API documentation
@@ -70,7 +246,7 @@ async def create_tax(
     try:
         errors = []
         for item in data:
-            result = tax_service.create_tax_code_ref(**item.dict())
+            result = await tax_service.create_tax_code_ref(**item.dict())
             if isinstance(result, tuple) and result[1]:
                 errors.append(result[1])
             elif isinstance(result, str) and result:
@@ -112,7 +288,7 @@ async def update_tax(
     try:
         errors = []
         for item in data:
-            result = tax_service.update_tax_code_ref(**item.dict())
+            result = await tax_service.update_tax_code_ref(**item.dict())
             if isinstance(result, tuple) and result[1]:
                 errors.append(result[1])
             elif isinstance(result, str) and result:
@@ -128,6 +304,79 @@ async def update_tax(
         )
 
 
+def _bulk_response(
+    items: List[TaxCreate], results: List[Tuple[Any, str]], success_message: str
+) -> Dict[str, Any]:
+    """Summarize per-row bulk results, keeping only the failed rows."""
+    errors = [
+        {"index": index, "tax_code_rcd": item.tax_code_rcd, "error": error}
+        for index, (item, (_, error)) in enumerate(zip(items, results))
+        if error
+    ]
+    return {
+        "message": "error" if errors else success_message,
+        "result": {"succeeded": len(items) - len(errors), "failed": len(errors), "errors": errors}
+    }
+
+
+@router.post(
+    "/bulk_create",
+    response_model=BulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Bulk create tax code references",
+    description="Create many tax code references in batched transactions, reporting errors per row."
+)
+async def bulk_create_tax(
+    data: List[TaxCreate],
+    batch_size: int = Query(TAX_BULK_BATCH_SIZE, ge=1, le=TAX_BULK_MAX_BATCH_SIZE),
+    tax_service: TaxService = Depends(get_tax_service)
+) -> Dict[str, Any]:
+    """Create tax code references in batches of ``batch_size`` rows.
+    
+    Every batch is one pipelined round trip and one commit. Rows that fail
+    are reported by index; the other rows of their batch are still created.
+    
+    Args:
+        data: List of tax data to create
+        batch_size: Maximum number of rows per transaction
+        tax_service: TaxService instance from dependency
+        
+    Returns:
+        Response with success/failure counts and per-row errors
+    """
+    results = await tax_service.create_tax_code_refs([item.dict() for item in data], batch_size)
+    return _bulk_response(data, results, "Created successfully")
+
+
+@router.put(
+    "/bulk_update",
+    response_model=BulkResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Bulk update tax code references",
+    description="Update many tax code references in batched transactions, reporting errors per row."
+)
+async def bulk_update_tax(
+    data: List[TaxUpdate],
+    batch_size: int = Query(TAX_BULK_BATCH_SIZE, ge=1, le=TAX_BULK_MAX_BATCH_SIZE),
+    tax_service: TaxService = Depends(get_tax_service)
+) -> Dict[str, Any]:
+    """Update tax code references in batches of ``batch_size`` rows.
+    
+    Every batch is one pipelined round trip and one commit. Rows that fail
+    are reported by index; the other rows of their batch are still updated.
+    
+    Args:
+        data: List of tax data to update
+        batch_size: Maximum number of rows per transaction
+        tax_service: TaxService instance from dependency
+        
+    Returns:
+        Response with success/failure counts and per-row errors
+    """
+    results = await tax_service.update_tax_code_refs([item.dict() for item in data], batch_size)
+    return _bulk_response(data, results, "Updated successfully")
+
+
 @router.delete(
     "/delete",
     response_model=SuccessResponse,
@@ -148,7 +397,7 @@ async def delete_tax(
     Returns:
         Response with deletion results
     """
-    result, error = tax_service.delete_multi_tax_code_ref(
+    result, error = await tax_service.delete_multi_tax_code_ref(
         delete_data.json_list_id,
         delete_data.updated_by
     )
@@ -166,12 +415,14 @@ async def delete_tax(
 )
 async def get_tax_by_id(
     tax_code_rcd: str,
+    not_modified: Optional[Response] = Depends(check_not_modified),
     tax_service: TaxService = Depends(get_tax_service)
-) -> Dict[str, Any]:
+) -> Any:
     """Get tax code reference details by ID.
     
     Args:
         tax_code_rcd: Tax code record ID
+        not_modified: 304 response if the client's copy is current
         tax_service: TaxService instance from dependency
         
     Returns:
@@ -180,7 +431,10 @@ async def get_tax_by_id(
     Raises:
         HTTPException: If record not found or error occurs
     """
-    result, error = tax_service.get_tax_code_ref_by_id(tax_code_rcd)
+    if not_modified:
+        return not_modified
+    
+    result, error = await tax_service.get_tax_code_ref_by_id(tax_code_rcd)
     
     if error:
         raise HTTPException(
@@ -197,6 +451,39 @@ async def get_tax_by_id(
     return {"data": result}
 
 
+@router.get(
+    "/tax_code_rcds",
+    status_code=status.HTTP_200_OK,
+    summary="Get tax code references by IDs",
+    description="Retrieve several tax code references in one pipelined database round trip."
+)
+async def get_taxes_by_ids(
+    tax_code_rcd: List[str] = Query(..., max_length=TAX_LOOKUP_MAX_IDS),
+    tax_service: TaxService = Depends(get_tax_service)
+) -> Dict[str, Any]:
+    """Get tax code reference details for several IDs.
+    
+    Args:
+        tax_code_rcd: Tax code record IDs, repeated query parameter
+        tax_service: TaxService instance from dependency
+        
+    Returns:
+        Details keyed by ID; unknown IDs map to an empty list
+        
+    Raises:
+        HTTPException: If an error occurs during the lookup
+    """
+    result, error = await tax_service.get_tax_code_refs_by_ids(tax_code_rcd)
+    
+    if error:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error
+        )
+    
+    return {"data": result}
+
+
 @router.get(
     "/dropdown",
     status_code=status.HTTP_200_OK,
@@ -205,18 +492,25 @@ async def get_tax_by_id(
 )
 async def get_tax_dropdown(
     lang: str,
+    row_format: RowFormat = Query("dict", description=ROW_FORMAT_DESCRIPTION),
+    not_modified: Optional[Response] = Depends(check_not_modified),
     tax_service: TaxService = Depends(get_tax_service)
-) -> Dict[str, Any]:
+) -> Any:
     """Get tax code references for dropdown selection.
     
     Args:
         lang: Language code
+        row_format: Result layout
+        not_modified: 304 response if the client's copy is current
         tax_service: TaxService instance from dependency
         
     Returns:
         List of tax code references formatted for dropdown
     """
-    result, error = tax_service.get_tax_code_ref_dropdown(lang)
+    if not_modified:
+        return not_modified
+    
+    result, error = await tax_service.get_tax_code_ref_dropdown(lang, row_format)
     
     if error:
         raise HTTPException(
@@ -231,28 +525,72 @@ async def get_tax_dropdown(
     "/search",
     status_code=status.HTTP_200_OK,
     summary="Search tax code references",
-    description="Search tax code references with optional filters and pagination."
+    description=(
+        "Search tax code references with optional filters and pagination. Pass cursor "
+        "(empty for the first page, then next_cursor) for keyset pagination, whose "
+        "pages cost the same however deep they are. Keyset pages have the same columns "
+        "and order as offset pages, with a null total_count."
+    )
 )
 async def search_tax(
     search_params: TaxSearch = Depends(),
+    row_format: RowFormat = Query("dict", description=ROW_FORMAT_DESCRIPTION),
+    not_modified: Optional[Response] = Depends(check_not_modified),
     tax_service: TaxService = Depends(get_tax_service)
-) -> Dict[str, Any]:
+) -> Any:
     """Search tax code references with filters and pagination.
     
     Args:
         search_params: Search parameters from query string
+        row_format: Result layout
+        not_modified: 304 response if the client's copy is current
         tax_service: TaxService instance from dependency
         
     Returns:
-        Search results with pagination
+        Search results with pagination, plus next_cursor in keyset mode
+        
+    Raises:
+        HTTPException: If the cursor or page size is invalid, or an error occurs
     """
-    result, error = tax_service.search_tax_code_ref(
+    if not_modified:
+        return not_modified
+    
+    if search_params.cursor is not None:
+        if search_params.page_size < 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="page_size must be at least 1"
+            )
+        try:
+            page, error = await tax_service.search_tax_code_ref_after(
+                search_params.cursor,
+                search_params.page_size,
+                search_params.lang,
+                search_params.tax_code_rcd or "",
+                search_params.tax_rule_rcd or "",
+                search_params.tax_code_ref_name or "",
+                row_format
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        if error:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=error
+            )
+        return page
+    
+    result, error = await tax_service.search_tax_code_ref(
         search_params.page_index,
         search_params.page_size,
         search_params.lang,
         search_params.tax_code_rcd or "",
         search_params.tax_rule_rcd or "",
-        search_params.tax_code_ref_name or ""
+        search_params.tax_code_ref_name or "",
+        row_format
     )
     
     if error:
@@ -261,4 +599,185 @@ async def search_tax(
             detail=error
         )
         
-    return {"data": result}
\ No newline at end of file
+    return {"data": result}
+
+def _ndjson_chunk(rows: List[Dict[str, Any]]) -> str:
+    """Serialize a batch of rows as newline-delimited JSON."""
+    return "".join(json.dumps(row, default=str, ensure_ascii=False) + "\n" for row in rows)
+
+
+def _csv_chunk(rows: List[Dict[str, Any]], header: bool) -> str:
+    """Serialize a batch of rows as CSV, with a header line if requested."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+async def _export_batches(
+    lang: str, tax_code_rcd: str, tax_rule_rcd: str, tax_code_ref_name: str
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Stream export batches on a connection owned by the stream itself.
+    
+    FastAPI tears down ``yield`` dependencies before a StreamingResponse body
+    is sent, so the request-scoped connection of get_tax_service would be
+    closed or back in the pool while the server-side cursor still reads from
+    it. This generator checks out its own connection and releases it when
+    the stream is exhausted or closed.
+    """
+    if USE_ASYNC_DB:
+        db_helper = AsyncDatabaseHelper(
+            connection_string=DATABASE_URL, use_pool=USE_POOL, prepare_statements=PREPARE_STORED_PROCEDURES
+        )
+        scope = db_helper.connection()
+    else:
+        db_helper = DatabaseHelper(
+            connection_string=DATABASE_URL, use_pool=USE_POOL, prepare_statements=PREPARE_STORED_PROCEDURES
+        )
+        scope = contextmanager_in_threadpool(db_helper.connection())
+    
+    async with scope:
+        batches = create_tax_service(db_helper).export_tax_code_refs(
+            lang, EXPORT_FETCH_SIZE, tax_code_rcd, tax_rule_rcd, tax_code_ref_name
+        )
+        try:
+            async for batch in batches:
+                yield batch
+        finally:
+            await batches.aclose()
+
+
+async def _serialize(
+    first: List[Dict[str, Any]], batches: AsyncIterator[List[Dict[str, Any]]], format: str
+) -> AsyncIterator[str]:
+    """Serialize the already fetched first batch, then the rest as it arrives."""
+    try:
+        batch = first
+        header = True
+        while batch:
+            yield _ndjson_chunk(batch) if format == "ndjson" else _csv_chunk(batch, header)
+            header = False
+            batch = await anext(batches, [])
+    finally:
+        await batches.aclose()
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export tax code references",
+    description="Stream every matching tax code reference as NDJSON or CSV without buffering the result set."
+)
+async def export_tax(
+    lang: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    tax_code_rcd: Optional[str] = None,
+    tax_rule_rcd: Optional[str] = None,
+    tax_code_ref_name: Optional[str] = None
+) -> StreamingResponse:
+    """Stream tax code references matching the filters.
+    
+    Rows are fetched from a server-side cursor in batches of
+    EXPORT_FETCH_SIZE and written out as they arrive, so memory use does not
+    grow with the result set. The stream holds its own database connection
+    until the last batch is sent. The first batch is fetched before the
+    response starts, so query errors still return 500; later errors abort
+    the stream.
+    
+    Args:
+        lang: Language code
+        format: "ndjson" (one JSON object per line) or "csv"
+        tax_code_rcd: Optional tax code record ID filter
+        tax_rule_rcd: Optional tax rule record ID filter
+        tax_code_ref_name: Optional reference name filter
+        
+    Returns:
+        Streaming response with the rows
+        
+    Raises:
+        HTTPException: If the query fails before any row is sent; 503 if no
+            pooled connection frees up in time
+    """
+    batches = _export_batches(lang, tax_code_rcd or "", tax_rule_rcd or "", tax_code_ref_name or "")
+    try:
+        first = await anext(batches, [])
+    except PoolTimeout as e:
+        await batches.aclose()
+        raise _pool_exhausted(e)
+    except Exception as e:
+        await batches.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error executing stored procedure: {str(e)}"
+        )
+    
+    if format == "csv":
+        media_type = "text/csv; charset=utf-8"
+        headers = {"Content-Disposition": 'attachment; filename="tax_code_ref.csv"'}
+    else:
+        media_type = "application/x-ndjson"
+        headers = {}
+    return StreamingResponse(_serialize(first, batches, format), media_type=media_type, headers=headers)
+
+
+@router.get(
+    "/cache/stats",
+    status_code=status.HTTP_200_OK,
+    summary="Get lookup cache statistics",
+    description="Hit/miss counters of the dropdown and get-by-id lookup cache."
+)
+async def get_cache_stats(
+    tax_service: TaxService = Depends(get_tax_service)
+) -> Dict[str, Any]:
+    """Get lookup cache statistics.
+    
+    Args:
+        tax_service: TaxService instance from dependency
+        
+    Returns:
+        Cache size and hit/miss counters
+    """
+    return {"data": tax_service.cache_stats()}
+
+
+@router.get(
+    "/prepared_statements/stats",
+    status_code=status.HTTP_200_OK,
+    summary="Get prepared statement statistics",
+    description="Per stored procedure, how many calls reused a statement already prepared on their connection."
+)
+async def get_prepared_statement_stats() -> Dict[str, Any]:
+    """Get prepared statement hit counts.
+    
+    Returns:
+        Executions, prepares, hits and hit ratio keyed by procedure name
+    """
+    return {"data": prepared_statements.stats()}
+
+
+@router.post(
+    "/procedure_signatures/refresh",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Refresh stored procedure signatures",
+    description="Reload cached stored procedure parameter types, e.g. after a migration."
+)
+async def refresh_signatures() -> Dict[str, Any]:
+    """Reload the stored procedure signature cache.
+    
+    Returns:
+        Response with the reloaded signatures
+        
+    Raises:
+        HTTPException: If the catalog cannot be queried
+    """
+    try:
+        result = await refresh_procedure_signatures()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    return {"message": "Refreshed successfully", "result": result}
@@ -1,13 +1,54 @@
 """API routes for data validation."""
 import logging
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Optional, Union
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 
+from data.database_helper import DatabaseHelper
+from services.data_loader import DataLoader
 from services.file_readers import FileReader
+from services.profiling import (
+    PROFILE_EXTENSIONS,
+    PROFILE_MEDIA_TYPES,
+    PSTATS_NEEDS_OWN_PROCESS,
+    Profile,
+    ProfileFormat,
+    ProfilerBusyError,
+    run_profiled,
+    save_profile,
+)
+from services.rule_reloader import RuleReloader
+from services.tax_service import tax_lookup_cache
 from services.validators import Validator
-from config.rules import VALIDATION_RULES
-from schemas.validation_response import ValidationResponse
+from services.validation_executor import (
+    ValidationExecutor,
+    ValidationJobError,
+    run_validation_job,
+    run_validation_load_job,
+)
+from services.response_formats import (
+    FORMAT_MEDIA_TYPES,
+    negotiate_response_format,
+    to_http_response,
+)
+from config.rules import LOAD_TARGETS
+from config.config import (
+    DATABASE_URL,
+    PREPARE_STORED_PROCEDURES,
+    PROFILE_DIR,
+    PROFILE_SLOW_THRESHOLD,
+    PROFILING_ENABLED,
+    RULES_RELOAD_INTERVAL,
+    USE_POOL,
+    VALIDATION_EXECUTOR,
+    VALIDATION_JOB_TIMEOUT,
+    VALIDATION_MAX_PENDING,
+    VALIDATION_MAX_WORKERS,
+)
+from schemas.validation_response import ErrorFormat, ValidationLoadResponse, ValidationResponse
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -19,42 +60,151 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Initialize executor for read + validate jobs
+validation_executor = ValidationExecutor(
+    mode=VALIDATION_EXECUTOR,
+    max_workers=VALIDATION_MAX_WORKERS,
+    max_pending=VALIDATION_MAX_PENDING,
+    timeout=VALIDATION_JOB_TIMEOUT,
+)
+
+# Validation rules compiled once and shared by all requests; recompiled
+# when config/rules.py changes
+validation_rules = RuleReloader("config.rules", "VALIDATION_RULES", RULES_RELOAD_INTERVAL)
+
 # Dependencies
 def get_validator() -> Validator:
-    """Dependency to get validator instance."""
-    return Validator(VALIDATION_RULES)
+    """Dependency to get the validator compiled from the current rules."""
+    return validation_rules.get()
 
 def get_file_reader() -> FileReader:
     """Dependency to get file reader instance."""
     return FileReader()
 
+def get_validation_executor() -> ValidationExecutor:
+    """Dependency to get the shared validation executor."""
+    return validation_executor
+
+def get_data_loader() -> DataLoader:
+    """Dependency to get data loader instance."""
+    db_helper = DatabaseHelper(
+        connection_string=DATABASE_URL, use_pool=USE_POOL, prepare_statements=PREPARE_STORED_PROCEDURES
+    )
+    return DataLoader(LOAD_TARGETS, db_helper)
+
+
+async def _spool_admitted(executor: ValidationExecutor, file_reader: FileReader, file: UploadFile) -> str:
+    """Reserve an executor slot, then spool the upload to disk.
+    
+    A saturated executor answers 429 before the upload is copied to a
+    temporary file. Starlette has already buffered the multipart body by
+    then, so this only saves the second, spooled copy. The slot is given back
+    if spooling fails. Submit the job with ``reserved=True``.
+    """
+    executor.reserve()
+    try:
+        return await file_reader.spool_to_disk(file)
+    except BaseException:
+        executor.release()
+        raise
+
+
+def _profile_response(profile: Profile, rule_id: str) -> Response:
+    """Return a requested profile as a downloadable file."""
+    return Response(
+        content=profile.data,
+        media_type=PROFILE_MEDIA_TYPES[profile.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="validate-{rule_id}.{PROFILE_EXTENSIONS[profile.format]}"',
+            "X-Validation-Seconds": f"{profile.seconds:.3f}",
+        },
+    )
+
+
+@router.post(
+    "/rules/reload",
+    status_code=status.HTTP_200_OK,
+    summary="Reload validation rules",
+    description="Re-import config/rules.py and recompile its rules without restarting the service."
+)
+async def reload_validation_rules() -> Dict[str, Any]:
+    """Reload and recompile the validation rules.
+    
+    Returns:
+        Response with the IDs of the loaded rules
+        
+    Raises:
+        HTTPException: If the rules cannot be imported or compiled; the
+            previous rules stay in use
+    """
+    try:
+        validator = await run_in_threadpool(validation_rules.reload)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Could not reload validation rules: {str(e)}"
+        )
+    return {"message": "Reloaded successfully", "result": sorted(validator.plans)}
+
 
 @router.post(
     "/{rule_id}",
     response_model=ValidationResponse,
+    response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
     summary="Validate uploaded Excel file",
-    description="Upload Excel file and validate it against specified rule set"
+    description=(
+        "Upload Excel file and validate it against specified rule set. "
+        "Validated data is returned as records by default; send an Accept header of "
+        f"{', '.join(FORMAT_MEDIA_TYPES[name] for name in ('columns', 'ndjson', 'arrow', 'parquet'))} "
+        "for column-oriented JSON, streamed NDJSON, Arrow IPC or Parquet."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "content": {media_type: {} for media_type in FORMAT_MEDIA_TYPES.values()}
+        }
+    }
 )
 async def validate_excel(
     rule_id: str,
     file: UploadFile = File(...),
+    chunked: bool = False,
+    error_format: ErrorFormat = "rows",
+    profile: Optional[ProfileFormat] = Query(
+        None,
+        description=(
+            "Return a profile of the read + validate job instead of its result: sampled "
+            '"collapsed" stacks for flame graphs, or cProfile "pstats". Requires PROFILING_ENABLED; '
+            'on Python 3.12+ "pstats" also requires the process executor.'
+        )
+    ),
+    accept: Optional[str] = Header(None),
     validator: Validator = Depends(get_validator),
-    file_reader: FileReader = Depends(get_file_reader)
-) -> ValidationResponse:
+    file_reader: FileReader = Depends(get_file_reader),
+    executor: ValidationExecutor = Depends(get_validation_executor)
+) -> Union[ValidationResponse, Response]:
     """Validate uploaded Excel file against specified rule set.
     
     Args:
         rule_id: ID of validation rule set to apply
         file: Uploaded Excel file
+        chunked: Read and validate the file chunk by chunk with bounded memory
+        error_format: Shape of the error map: per-row column lists ("rows"),
+            per-column row lists ("columns") or per-column row ranges ("ranges")
+        profile: Profile format to return instead of the validation result
+        accept: Accept header selecting the format of validated data
         validator: Validator instance (injected)
         file_reader: FileReader instance (injected)
+        executor: ValidationExecutor instance (injected)
         
     Returns:
-        ValidationResponse object with validation results
+        ValidationResponse object with validation results, a raw response
+        in the negotiated format when the file is valid, or the profile
         
     Raises:
-        HTTPException: For invalid rule_id, file format, or missing columns
+        HTTPException: For invalid rule_id, file format, or missing columns;
+            403 when profiling is disabled, 406 for unsupported Accept headers,
+            429 when the executor is saturated, 504 when a job times out
     """
     try:
         # Check file extension
@@ -64,15 +214,81 @@ async def validate_excel(
                 detail="Only Excel files (.xlsx, .xls) are supported"
             )
         
-        # Read file
-        logger.info(f"Reading file {file.filename}")
-        df = await file_reader.read_excel(file)
+        if profile and not PROFILING_ENABLED:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Profiling is disabled"
+            )
+        
+        response_format = negotiate_response_format(accept)
         
-        # Validate data
-        logger.info(f"Validating file against rule {rule_id}")
-        result = validator.validate(df, rule_id)
+        if profile or PROFILE_SLOW_THRESHOLD is not None:
+            # Profile the job where it runs, so only this request is sampled
+            logger.info(f"Profiling validation of file {file.filename} against rule {rule_id}")
+            if profile == "pstats" and PSTATS_NEEDS_OWN_PROCESS and executor.mode != "process":
+                # The one cProfile of the process would also record every other request
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail='pstats profiles need the process executor on this Python version; ask for "collapsed" instead'
+                )
+            if executor.enabled:
+                path = await _spool_admitted(executor, file_reader, file)
+            else:
+                path = await file_reader.spool_to_disk(file)
+            args = (
+                profile, PROFILE_SLOW_THRESHOLD, run_validation_job,
+                file_reader, validator, path, rule_id, chunked, error_format, response_format,
+            )
+            try:
+                if executor.enabled:
+                    result, captured = await executor.submit(
+                        run_profiled, *args, cleanup=lambda: os.remove(path), reserved=True
+                    )
+                else:
+                    try:
+                        result, captured = await run_in_threadpool(run_profiled, *args)
+                    except ValidationJobError as e:
+                        raise HTTPException(status_code=e.status_code, detail=e.detail)
+                    finally:
+                        os.remove(path)
+            except ProfilerBusyError as e:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+            
+            if profile:
+                return _profile_response(captured, rule_id)
+            if captured:
+                saved = save_profile(captured, PROFILE_DIR, f"{rule_id}-{file.filename}")
+                logger.warning(
+                    f"Validation of file {file.filename} took {captured.seconds:.1f} seconds; profile saved to {saved}"
+                )
+            return to_http_response(result, response_format)
+        
+        if executor.enabled:
+            # Spool upload to disk and run read + validate in the pool
+            logger.info(f"Submitting file {file.filename} for validation against rule {rule_id}")
+            path = await _spool_admitted(executor, file_reader, file)
+            result = await executor.submit(
+                run_validation_job, file_reader, validator, path, rule_id, chunked, error_format,
+                response_format,
+                cleanup=lambda: os.remove(path),
+                reserved=True
+            )
+            return to_http_response(result, response_format)
         
-        return result
+        # Spool upload to disk and run read + validate in a worker thread,
+        # keeping the parsing and the validation off the event loop
+        logger.info(f"Reading and validating file {file.filename} against rule {rule_id}")
+        path = await file_reader.spool_to_disk(file)
+        try:
+            result = await run_in_threadpool(
+                run_validation_job, file_reader, validator, path, rule_id, chunked, error_format,
+                response_format
+            )
+        except ValidationJobError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        finally:
+            os.remove(path)
+        return to_http_response(result, response_format)
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -83,4 +299,78 @@ async def validate_excel(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Validation error: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post(
+    "/{rule_id}/load",
+    response_model=ValidationLoadResponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+    summary="Validate uploaded Excel file and load it into the database",
+    description=(
+        "Upload Excel file, validate it against specified rule set and, if it is valid, "
+        "COPY its rows into a staging table and merge them into the table configured for the rule "
+        "with its set-based load procedure, in one transaction."
+    )
+)
+async def validate_and_load_excel(
+    rule_id: str,
+    file: UploadFile = File(...),
+    loaded_by: str = Query(..., description="User ID recorded on the loaded rows"),
+    chunked: bool = False,
+    error_format: ErrorFormat = "rows",
+    validator: Validator = Depends(get_validator),
+    file_reader: FileReader = Depends(get_file_reader),
+    data_loader: DataLoader = Depends(get_data_loader),
+    executor: ValidationExecutor = Depends(get_validation_executor)
+) -> ValidationLoadResponse:
+    """Validate uploaded Excel file and load the validated rows.
+    
+    Args:
+        rule_id: ID of validation rule set to apply
+        file: Uploaded Excel file
+        loaded_by: User ID recorded on the loaded rows
+        chunked: Stream validated chunks into the database while reading
+        error_format: Shape of the error map: "rows", "columns" or "ranges"
+        validator: Validator instance (injected)
+        file_reader: FileReader instance (injected)
+        data_loader: DataLoader instance (injected)
+        executor: ValidationExecutor instance (injected)
+        
+    Returns:
+        ValidationLoadResponse with validation errors, or the number of loaded rows
+        
+    Raises:
+        HTTPException: For invalid rule_id, file format, missing columns or load
+            target; 429 when the executor is saturated, 504 when a job times out
+    """
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only Excel files (.xlsx, .xls) are supported"
+        )
+    data_loader.get_target(rule_id)
+    
+    logger.info(f"Validating and loading file {file.filename} against rule {rule_id}")
+    if executor.enabled:
+        path = await _spool_admitted(executor, file_reader, file)
+    else:
+        path = await file_reader.spool_to_disk(file)
+    args = (file_reader, validator, data_loader, path, rule_id, chunked, error_format, loaded_by)
+    if executor.enabled:
+        result = await executor.submit(
+            run_validation_load_job, *args, cleanup=lambda: os.remove(path), reserved=True
+        )
+    else:
+        try:
+            result = await run_in_threadpool(run_validation_load_job, *args)
+        except ValidationJobError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        finally:
+            os.remove(path)
+    
+    if result.loaded_rows:
+        # The load bypasses TaxService, so drop the tax lookups it may have changed
+        tax_lookup_cache.invalidate()
+    return result
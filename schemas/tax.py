@@ -25,9 +25,12 @@ class TaxDelete(BaseModel):
 
 
 class TaxSearch(BaseModel):
-    page_index: int
+    page_index: int = 1
     page_size: int
     lang: str
+    # Keyset pagination: "" for the first page, then the previous next_cursor;
+    # page_index is ignored when a cursor is given
+    cursor: Optional[str] = None
     tax_code_rcd: Optional[str] = None
     tax_rule_rcd: Optional[str] = None
     tax_code_ref_name: Optional[str] = None
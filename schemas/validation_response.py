@@ -1,21 +1,53 @@
 """Schema definitions for validation responses."""
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+# Shape of the error map returned by the validator
+ErrorFormat = Literal["rows", "columns", "ranges"]
+
 
 class ValidationResponse(BaseModel):
     """Response schema for validation results.
     
     Attributes:
         errors: Dictionary mapping row indices to lists of invalid column names
+        column_errors: Dictionary mapping column names to invalid row indices
+            (only with the "columns" error format)
+        column_error_ranges: Dictionary mapping column names to inclusive
+            [start, end] ranges of invalid rows (only with the "ranges" error format)
         data: List of records after validation (empty if validation failed)
     """
     errors: Dict[int, List[str]] = Field(
         default_factory=dict,
         description="Dictionary mapping row indices to lists of invalid column names"
     )
+    column_errors: Optional[Dict[str, List[int]]] = Field(
+        default=None,
+        description="Dictionary mapping column names to invalid row indices"
+    )
+    column_error_ranges: Optional[Dict[str, List[List[int]]]] = Field(
+        default=None,
+        description="Dictionary mapping column names to inclusive [start, end] ranges of invalid rows"
+    )
     data: List[Dict[str, Any]] = Field(
         default_factory=list,
         description="List of records after validation (empty if validation failed)"
-    )
\ No newline at end of file
+    )
+
+
+class ValidationLoadResponse(ValidationResponse):
+    """Response schema for validate-and-load results.
+    
+    Attributes:
+        table: Table the validated rows were loaded into (absent if validation failed)
+        loaded_rows: Number of rows inserted or updated (absent if validation failed)
+    """
+    table: Optional[str] = Field(
+        default=None,
+        description="Table the validated rows were loaded into"
+    )
+    loaded_rows: Optional[int] = Field(
+        default=None,
+        description="Number of rows inserted or updated"
+    )
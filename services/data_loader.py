@@ -0,0 +1,128 @@
+"""Module for loading validated data into PostgreSQL with COPY."""
+import logging
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from fastapi import HTTPException, status
+
+from config.config import LOAD_CSV_BLOCK_ROWS, MAX_CONN, MIN_CONN, POOL_TIMEOUT
+from config.rules import LoadTarget
+from data.database_helper import DatabaseHelper
+from services.validators import ValidationErrors
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class LoadAborted(Exception):
+    """Raised into an open COPY to roll back a load whose data failed validation."""
+
+
+class DataLoader:
+    """Loads validated DataFrames into the table configured for a rule ID.
+
+    Rows are streamed into a staging table with ``COPY FROM STDIN`` and
+    merged into the target by one call of the target's set-based stored
+    procedure, instead of one create or update call per row.
+    """
+
+    def __init__(self, load_targets: Dict[str, LoadTarget], db_helper: DatabaseHelper):
+        """Initialize with load targets and a database helper.
+
+        Args:
+            load_targets: Target table configuration keyed by rule ID
+            db_helper: DatabaseHelper used for the load; it must not hold an
+                open connection so the loader can be sent to worker processes.
+                With ``use_pool`` a process without a sync pool yet, such as
+                a worker process, opens one on its first load
+        """
+        self.load_targets = load_targets
+        self.db = db_helper
+
+    def get_target(self, rule_id: str) -> LoadTarget:
+        """Look up the load target for a rule ID.
+
+        Args:
+            rule_id: ID of validation rules
+
+        Returns:
+            Target table configuration
+
+        Raises:
+            HTTPException: If no target is configured for the rule ID
+        """
+        if rule_id not in self.load_targets:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No load target configured for rule ID: {rule_id}"
+            )
+        return self.load_targets[rule_id]
+
+    def load(
+        self,
+        frames: Iterable[pd.DataFrame],
+        rule_id: str,
+        loaded_by: str,
+        errors: Optional[ValidationErrors] = None,
+    ) -> Tuple[int, str]:
+        """Stream validated frames into the target table of a rule ID.
+
+        ``frames`` may be a lazy chunk iterator that is still being validated;
+        if ``errors`` is not empty once it is exhausted, the load is rolled
+        back and nothing is merged.
+
+        Args:
+            frames: Validated DataFrames, in file order
+            rule_id: ID of validation rules the frames were validated against
+            loaded_by: User ID passed to the target's procedure
+            errors: Errors filled in while ``frames`` is consumed, if any
+
+        Returns:
+            Tuple containing (number of rows inserted or updated, error_message)
+
+        Raises:
+            HTTPException: If no target is configured, or raised while reading
+                and validating ``frames``
+        """
+        target = self.get_target(rule_id)
+        columns = list(target["columns"].values())
+
+        # COPY swallows exceptions from its input; keep them to re-raise
+        failures: List[Exception] = []
+
+        def blocks() -> Iterator[str]:
+            try:
+                yield from self._iter_csv_blocks(frames, target)
+                if errors:
+                    raise LoadAborted(f"Validation failed for rule ID {rule_id}")
+            except Exception as e:
+                failures.append(e)
+                raise
+
+        if self.db.use_pool:
+            DatabaseHelper.initialize_pool(MIN_CONN, MAX_CONN, self.db.connection_string, POOL_TIMEOUT)
+
+        start_time = time.time()
+        with self.db.connection():
+            loaded, error = self.db.copy_load(
+                target["table"], target["staging"], columns, blocks(),
+                target["procedure"], loaded_by, *target.get("params", [])
+            )
+        if failures:
+            if isinstance(failures[0], LoadAborted):
+                return 0, ""
+            raise failures[0]
+
+        elapsed_time = time.time() - start_time
+        logger.info(f"Loaded {loaded} rows into {target['table']} in {elapsed_time:.3f} seconds")
+        return loaded, error
+
+    @staticmethod
+    def _iter_csv_blocks(frames: Iterable[pd.DataFrame], target: LoadTarget) -> Iterator[str]:
+        """Serialize frames as header-less CSV in the target's column order."""
+        mapping = target["columns"]
+        for frame in frames:
+            out = frame[list(mapping)].rename(columns=mapping)
+            for start in range(0, len(out), LOAD_CSV_BLOCK_ROWS):
+                yield out.iloc[start:start + LOAD_CSV_BLOCK_ROWS].to_csv(index=False, header=False)
@@ -1,94 +1,438 @@
 """Module for reading Excel files into pandas DataFrames."""
+import asyncio
 import logging
+import os
+import queue
+import tempfile
+import threading
 import time
 from io import BytesIO, StringIO
-from typing import Protocol
+from typing import Dict, Iterator, List, Optional, Protocol, Union
 
 import pandas as pd
 from fastapi import UploadFile
+from openpyxl import load_workbook
 from xlsx2csv import Xlsx2csv
 
+from config.config import EXCEL_CHUNK_SIZE, UPLOAD_SPOOL_BLOCK_SIZE
+from services.metrics import observe
+from services.profiling import follow_thread
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Type alias for an Excel source: raw bytes or a path to a file on disk
+ExcelSource = Union[bytes, str]
+
+# Type alias for per-column dtype hints passed to the reader
+DtypeHints = Optional[Dict[str, type]]
+
+
+def _open_source(source: ExcelSource) -> Union[BytesIO, str]:
+    """Wrap raw bytes in a buffer, pass paths through unchanged."""
+    return BytesIO(source) if isinstance(source, bytes) else source
+
 
 class ExcelConverter(Protocol):
     """Protocol for Excel conversion strategies."""
-    
-    async def convert(self, file_contents: bytes) -> pd.DataFrame:
+
+    async def convert(self, file_contents: ExcelSource, dtype: DtypeHints = None) -> pd.DataFrame:
         """Convert Excel file contents to DataFrame.
-        
+
         Args:
-            file_contents: Raw bytes of the Excel file
-            
+            file_contents: Raw bytes of the Excel file or a path to it
+            dtype: Optional per-column dtype hints, applied as in ``iter_chunks``
+
         Returns:
             Pandas DataFrame containing the Excel data
         """
         ...
 
+    def iter_chunks(
+        self, path: str, chunk_size: int, dtype: DtypeHints = None
+    ) -> Iterator[pd.DataFrame]:
+        """Parse the first sheet incrementally and yield DataFrame chunks.
+
+        Args:
+            path: Path to the Excel file on disk
+            chunk_size: Maximum number of rows per chunk
+            dtype: Optional per-column dtype hints
+
+        Yields:
+            DataFrames of at most ``chunk_size`` rows, indexed by their
+            global row position in the sheet
+        """
+        ...
+
+
+class _ConversionAborted(Exception):
+    """Raised inside the xlsx2csv worker when the consumer stops reading."""
+
+
+class _ChunkedCsvSink:
+    """File-like object handed to xlsx2csv that groups CSV rows into chunks.
+
+    ``csv.writer`` issues one ``write`` call per row, so every call is one
+    line. Completed chunks are pushed onto a bounded queue, which blocks the
+    parser whenever the consumer falls behind.
+    """
+
+    def __init__(self, out_queue: queue.Queue, chunk_size: int, stop: threading.Event):
+        self._queue = out_queue
+        self._chunk_size = chunk_size
+        self._stop = stop
+        self._lines: List[str] = []
+
+    def write(self, line: str) -> None:
+        self._lines.append(line)
+        if len(self._lines) >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            self.put(self._lines)
+            self._lines = []
+
+    def put(self, item) -> None:
+        while True:
+            if self._stop.is_set():
+                raise _ConversionAborted()
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
 
 class Xlsx2csvConverter:
     """Excel converter implementation using xlsx2csv library."""
-    
-    async def convert(self, file_contents: bytes) -> pd.DataFrame:
+
+    async def convert(self, file_contents: ExcelSource, dtype: DtypeHints = None) -> pd.DataFrame:
         """Convert Excel file to DataFrame using xlsx2csv.
-        
+
         Args:
-            file_contents: Raw bytes of the Excel file
-            
+            file_contents: Raw bytes of the Excel file or a path to it
+            dtype: Optional per-column dtype hints for the CSV parser, the
+                same ones ``iter_chunks`` applies, so both read a cell alike
+
         Returns:
             Pandas DataFrame containing the Excel data
         """
-        output = StringIO()
-        Xlsx2csv(BytesIO(file_contents), outputencoding="utf-8").convert(output)
-        
-        output.seek(0)
-        return pd.read_csv(output)
+        if isinstance(file_contents, bytes):
+            output = StringIO()
+            Xlsx2csv(BytesIO(file_contents), outputencoding="utf-8").convert(output)
+            output.seek(0)
+            return pd.read_csv(output, dtype=dtype)
+
+        # Spool the intermediate CSV to disk instead of keeping a text copy in memory
+        fd, csv_path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            Xlsx2csv(file_contents, outputencoding="utf-8").convert(csv_path)
+            return pd.read_csv(csv_path, dtype=dtype)
+        finally:
+            os.remove(csv_path)
+
+    def iter_chunks(
+        self, path: str, chunk_size: int, dtype: DtypeHints = None
+    ) -> Iterator[pd.DataFrame]:
+        """Stream the sheet through xlsx2csv and yield DataFrame chunks.
+
+        xlsx2csv parses the sheet XML with expat and pushes rows out; it runs
+        in a worker thread feeding a bounded queue, so at most a couple of
+        chunks are held in memory at any time.
+
+        Args:
+            path: Path to the Excel file on disk
+            chunk_size: Maximum number of rows per chunk
+            dtype: Optional per-column dtype hints for the CSV parser; every
+                cell is text at that point, so ``str`` keeps it as read
+
+        Yields:
+            DataFrames of at most ``chunk_size`` rows
+        """
+        out_queue: queue.Queue = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        done = object()
+        sink = _ChunkedCsvSink(out_queue, chunk_size, stop)
+
+        def produce() -> None:
+            try:
+                Xlsx2csv(path, outputencoding="utf-8").convert(sink)
+                sink.flush()
+                sink.put(done)
+            except _ConversionAborted:
+                pass
+            except Exception as e:
+                try:
+                    sink.put(e)
+                except _ConversionAborted:
+                    pass
+
+        worker = threading.Thread(target=follow_thread(produce), name="xlsx2csv-reader", daemon=True)
+        worker.start()
+
+        header: Optional[str] = None
+        pending: List[str] = []
+        offset = 0
+        try:
+            while True:
+                item = out_queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if header is None:
+                    header, item = item[0], item[1:]
+                pending.extend(item)
+                while len(pending) >= chunk_size:
+                    batch, pending = pending[:chunk_size], pending[chunk_size:]
+                    chunk = self._parse_batch(header, batch, offset, dtype)
+                    # Blank lines are skipped by the CSV parser, so a batch may come back empty
+                    if len(chunk):
+                        offset += len(chunk)
+                        yield chunk
+            if header is not None:
+                chunk = self._parse_batch(header, pending, offset, dtype)
+                if len(chunk) or offset == 0:
+                    yield chunk
+        finally:
+            stop.set()
+            worker.join()
+
+    @staticmethod
+    def _parse_batch(
+        header: str, lines: List[str], offset: int, dtype: DtypeHints
+    ) -> pd.DataFrame:
+        """Parse a batch of CSV lines under the sheet header into a DataFrame."""
+        chunk = pd.read_csv(StringIO(header + "".join(lines)), dtype=dtype)
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        return chunk
 
 
 class PandasConverter:
     """Excel converter implementation using pandas directly."""
-    
-    async def convert(self, file_contents: bytes) -> pd.DataFrame:
+
+    async def convert(self, file_contents: ExcelSource, dtype: DtypeHints = None) -> pd.DataFrame:
         """Convert Excel file to DataFrame using pandas.
-        
+
         Args:
-            file_contents: Raw bytes of the Excel file
-            
+            file_contents: Raw bytes of the Excel file or a path to it
+            dtype: Ignored, as in ``iter_chunks``
+
         Returns:
             Pandas DataFrame containing the Excel data
         """
-        return pd.read_excel(BytesIO(file_contents))
+        return pd.read_excel(_open_source(file_contents))
+
+    def iter_chunks(
+        self, path: str, chunk_size: int, dtype: DtypeHints = None
+    ) -> Iterator[pd.DataFrame]:
+        """Read the sheet with openpyxl in read-only mode and yield chunks.
+
+        Read-only workbooks parse the sheet XML lazily while rows are
+        iterated, so only the current chunk of rows is materialized.
+
+        Cells come back with the type stored in the workbook, which does not
+        depend on the chunk they land in, so ``dtype`` hints are ignored:
+        casting them would turn numbers into strings before validation and
+        accept values that ``convert`` rejects.
+
+        Args:
+            path: Path to the Excel file on disk
+            chunk_size: Maximum number of rows per chunk
+            dtype: Ignored; accepted for the ExcelConverter protocol
+
+        Yields:
+            DataFrames of at most ``chunk_size`` rows
+        """
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                yield pd.DataFrame()
+                return
+            columns = [
+                name if name is not None else f"Unnamed: {i}"
+                for i, name in enumerate(header)
+            ]
+
+            offset = 0
+            batch: List[tuple] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    yield self._build_chunk(batch, columns, offset)
+                    offset += len(batch)
+                    batch = []
+            if batch or offset == 0:
+                yield self._build_chunk(batch, columns, offset)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _build_chunk(rows: List[tuple], columns: List[str], offset: int) -> pd.DataFrame:
+        """Build a DataFrame chunk from raw openpyxl row tuples."""
+        return pd.DataFrame(
+            [row[:len(columns)] for row in rows],
+            columns=columns,
+            index=pd.RangeIndex(offset, offset + len(rows)),
+        ).infer_objects()
 
 
 class FileReader:
     """Class for reading Excel files and converting them to DataFrames."""
-    
+
     def __init__(self, converter: ExcelConverter = None):
         """Initialize with converter strategy.
-        
+
         Args:
             converter: Strategy for converting Excel files to DataFrames
         """
         self.converter = converter or Xlsx2csvConverter()
-    
-    async def read_excel(self, file: UploadFile) -> pd.DataFrame:
+
+    @staticmethod
+    async def spool_to_disk(file: UploadFile, block_size: int = UPLOAD_SPOOL_BLOCK_SIZE) -> str:
+        """Copy an upload to a temporary file in fixed-size blocks.
+
+        Args:
+            file: Uploaded Excel file
+            block_size: Number of bytes read from the upload per iteration
+
+        Returns:
+            Path of the temporary file; the caller is responsible for removing it
+        """
+        suffix = os.path.splitext(file.filename or "")[1] or ".xlsx"
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    block = await file.read(block_size)
+                    if not block:
+                        break
+                    out.write(block)
+                    size += len(block)
+        except Exception:
+            os.remove(path)
+            raise
+        observe("upload_size_bytes", size)
+        return path
+
+    async def read_excel(self, file: UploadFile, dtype: DtypeHints = None) -> pd.DataFrame:
         """Read Excel file and return as DataFrame.
-        
-        Uses the configured converter strategy to read the file efficiently.
-        
+
+        The upload is spooled to disk first so the converter reads from a
+        file instead of an in-memory copy of the workbook.
+
         Args:
             file: Uploaded Excel file
-            
+            dtype: Optional per-column dtype hints; pass the same hints as to
+                ``read_excel_chunks`` so both read the file alike
+
+        Returns:
+            Pandas DataFrame containing the Excel data
+        """
+        start_time = time.time()
+
+        path = await self.spool_to_disk(file)
+        try:
+            df = await self.converter.convert(path, dtype)
+        finally:
+            os.remove(path)
+
+        elapsed_time = time.time() - start_time
+        observe("conversion_seconds", elapsed_time, self.converter.__class__.__name__, "full")
+        logger.info(f"Excel file read in {elapsed_time:.3f} seconds using {self.converter.__class__.__name__}")
+
+        return df
+
+    def read_excel_path(self, path: str, dtype: DtypeHints = None) -> pd.DataFrame:
+        """Read an Excel file already on disk, outside of any event loop.
+
+        Used by worker threads and processes, which have no running loop of
+        their own.
+
+        Args:
+            path: Path to the Excel file
+            dtype: Optional per-column dtype hints, as for ``iter_path_chunks``
+
         Returns:
             Pandas DataFrame containing the Excel data
         """
         start_time = time.time()
-        
-        contents = await file.read()
-        df = await self.converter.convert(contents)
-        
+
+        df = asyncio.run(self.converter.convert(path, dtype))
+
         elapsed_time = time.time() - start_time
+        observe("conversion_seconds", elapsed_time, self.converter.__class__.__name__, "full")
         logger.info(f"Excel file read in {elapsed_time:.3f} seconds using {self.converter.__class__.__name__}")
-        
-        return df
\ No newline at end of file
+
+        return df
+
+    async def read_excel_chunks(
+        self,
+        file: UploadFile,
+        chunk_size: int = EXCEL_CHUNK_SIZE,
+        dtype: DtypeHints = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Spool an upload to disk and return an iterator of DataFrame chunks.
+
+        Peak memory is bounded by ``chunk_size`` rather than the size of the
+        workbook. The temporary file is removed once the iterator is exhausted
+        or closed.
+
+        Args:
+            file: Uploaded Excel file
+            chunk_size: Maximum number of rows per chunk
+            dtype: Optional per-column dtype hints, e.g. ``{"Mã thuế": str}``
+
+        Returns:
+            Iterator of DataFrames indexed by global row position
+        """
+        path = await self.spool_to_disk(file)
+        return self.iter_path_chunks(path, chunk_size, dtype, remove=True)
+
+    def iter_path_chunks(
+        self,
+        path: str,
+        chunk_size: int = EXCEL_CHUNK_SIZE,
+        dtype: DtypeHints = None,
+        remove: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield DataFrame chunks for an Excel file already on disk.
+
+        Args:
+            path: Path to the Excel file
+            chunk_size: Maximum number of rows per chunk
+            dtype: Optional per-column dtype hints
+            remove: Whether to delete the file once iteration finishes
+
+        Yields:
+            DataFrames indexed by global row position
+        """
+        start_time = time.time()
+        rows = 0
+        # Time spent producing chunks, excluding the consumer's work between them
+        converting = 0.0
+        chunks = self.converter.iter_chunks(path, chunk_size, dtype)
+        try:
+            while True:
+                chunk_start = time.perf_counter()
+                chunk = next(chunks, None)
+                converting += time.perf_counter() - chunk_start
+                if chunk is None:
+                    break
+                rows += len(chunk)
+                yield chunk
+        finally:
+            chunks.close()
+            if remove and os.path.exists(path):
+                os.remove(path)
+            observe("conversion_seconds", converting, self.converter.__class__.__name__, "chunked")
+            elapsed_time = time.time() - start_time
+            logger.info(
+                f"Excel file streamed ({rows} rows) in {elapsed_time:.3f} seconds "
+                f"using {self.converter.__class__.__name__}"
+            )
@@ -0,0 +1,128 @@
+"""In-process LRU cache with TTL expiry for read-mostly lookups."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LookupCache:
+    """Thread-safe LRU cache whose entries also expire after a TTL.
+
+    When full, the least recently used entry is evicted. Hits and misses are
+    counted so the cache's effectiveness can be monitored.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 300.0):
+        """Initialize an empty cache.
+
+        Args:
+            max_size: Maximum number of entries; 0 disables caching
+            ttl: Seconds an entry stays valid, or None for no expiry
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._generation = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Look up a key, refreshing its LRU position on a hit.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple containing (found, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every full or predicate invalidation."""
+        return self._generation
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache; callers must not mutate it afterwards
+            generation: ``generation`` read before the value was fetched; if the
+                cache was cleared since, the value may be stale and is dropped
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when no key is given.
+
+        Args:
+            key: Cache key, or None for all
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._generation += 1
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key satisfies a predicate.
+
+        Also bumps ``generation``, so fetches already in flight for a dropped
+        key are not cached with data read before the change.
+
+        Args:
+            predicate: Called with each key; entries it returns True for are dropped
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self._generation += 1
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters.
+
+        Returns:
+            Dictionary with size, max_size, hits, misses, evictions and hit_ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,87 @@
+"""Prometheus metrics for the Excel read + validate pipeline."""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Histogram
+
+# Seconds; conversions of large workbooks take minutes
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Bytes, 16 KiB to 256 MiB
+SIZE_BUCKETS = tuple(16 * 1024 * 4 ** i for i in range(8))
+
+upload_size_bytes = Histogram(
+    "validation_upload_size_bytes", "Size of uploaded Excel files", buckets=SIZE_BUCKETS
+)
+conversion_seconds = Histogram(
+    "validation_conversion_seconds", "Time spent converting Excel files to DataFrames",
+    ["converter", "mode"], buckets=DURATION_BUCKETS
+)
+validation_seconds = Histogram(
+    "validation_seconds", "Time spent validating and converting a file's columns",
+    ["rule_id"], buckets=DURATION_BUCKETS
+)
+column_validation_seconds = Histogram(
+    "validation_column_seconds", "Time spent validating one column of a file or chunk",
+    ["rule_id", "column"], buckets=DURATION_BUCKETS
+)
+serialization_seconds = Histogram(
+    "validation_serialization_seconds", "Time spent rendering validation results",
+    ["format"], buckets=DURATION_BUCKETS
+)
+
+_histograms: Dict[str, Histogram] = {
+    "upload_size_bytes": upload_size_bytes,
+    "conversion_seconds": conversion_seconds,
+    "validation_seconds": validation_seconds,
+    "column_validation_seconds": column_validation_seconds,
+    "serialization_seconds": serialization_seconds,
+}
+
+# Observation as shipped from a worker process: (histogram, label values, value)
+Observation = Tuple[str, Tuple[str, ...], float]
+
+# Set while a job runs in a worker process, whose registry nobody scrapes
+_recorded: Optional[List[Observation]] = None
+
+
+def observe(name: str, value: float, *labels: str) -> None:
+    """Record one observation of a pipeline histogram.
+
+    Args:
+        name: Histogram name, e.g. "conversion_seconds"
+        value: Observed value
+        labels: Label values, in the order the histogram declares them
+    """
+    if _recorded is not None:
+        _recorded.append((name, labels, value))
+        return
+    histogram = _histograms[name]
+    (histogram.labels(*labels) if labels else histogram).observe(value)
+
+
+def run_recorded(func: Callable[..., Any], *args: Any) -> Tuple[Any, List[Observation]]:
+    """Run a job in a worker process and hand its observations back with the result.
+
+    Args:
+        func: Job to run
+        args: Arguments for ``func``
+
+    Returns:
+        Tuple of (job result, observations to pass to ``replay``)
+    """
+    global _recorded
+    _recorded = []
+    try:
+        return func(*args), _recorded
+    finally:
+        _recorded = None
+
+
+def replay(observations: List[Observation]) -> None:
+    """Record observations made in a worker process in this process.
+
+    Args:
+        observations: Observations returned by ``run_recorded``
+    """
+    for name, labels, value in observations:
+        observe(name, value, *labels)
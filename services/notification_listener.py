@@ -0,0 +1,87 @@
+"""Background LISTEN task that forwards PostgreSQL notifications to a callback."""
+import asyncio
+import logging
+from typing import Callable, Optional
+
+import psycopg
+from psycopg import sql
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class NotificationListener:
+    """Listens on a PostgreSQL channel from a dedicated async connection.
+
+    Runs as a task on the application's event loop. If the connection drops
+    it reconnects with exponential backoff and calls ``on_reconnect``, since
+    notifications sent while disconnected are lost.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_reconnect: Optional[Callable[[], None]] = None,
+        max_backoff: float = 30.0,
+    ):
+        """Initialize listener settings; nothing connects until ``start``.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            channel: Channel to LISTEN on
+            on_notify: Called with each notification payload
+            on_reconnect: Called after the connection is re-established
+            max_backoff: Upper bound in seconds between reconnect attempts
+        """
+        self.connection_string = connection_string
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_reconnect = on_reconnect
+        self.max_backoff = max_backoff
+        self.connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start listening in a background task on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"listen-{self.channel}")
+
+    async def stop(self) -> None:
+        """Cancel the background task and close its connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        reconnecting = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.connection_string, autocommit=True
+                ) as conn:
+                    await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                    logger.info(f"Listening for notifications on {self.channel}")
+                    self.connected.set()
+                    backoff = 1.0
+                    if reconnecting and self.on_reconnect:
+                        self.on_reconnect()
+                    async for notify in conn.notifies():
+                        try:
+                            self.on_notify(notify.payload)
+                        except Exception:
+                            logger.exception(f"Failed to handle notification on {self.channel}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Listener on {self.channel} disconnected: {str(e)}; retrying in {backoff:.0f}s")
+            self.connected.clear()
+            reconnecting = True
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
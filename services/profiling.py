@@ -0,0 +1,265 @@
+"""Module for profiling read + validate jobs."""
+import cProfile
+import marshal
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Literal, NamedTuple, Optional, Tuple, Union
+
+from config.config import PROFILE_KEEP_FILES, PROFILE_SAMPLE_INTERVAL
+
+# "collapsed": sampled stacks, one "frame;frame;frame count" line each, for
+# flamegraph.pl or speedscope, with helper threads of the job under a
+# "[thread name]" root; "pstats": cProfile output for pstats or snakeviz
+ProfileFormat = Literal["collapsed", "pstats"]
+
+PROFILE_MEDIA_TYPES = {"collapsed": "text/plain", "pstats": "application/octet-stream"}
+
+PROFILE_EXTENSIONS = {"collapsed": "folded", "pstats": "prof"}
+
+# From Python 3.12 cProfile runs on sys.monitoring: only one profiler can be
+# active per process, and it records every thread. A pstats profile then only
+# covers a single job when that job has a worker process to itself.
+PSTATS_NEEDS_OWN_PROCESS = sys.version_info >= (3, 12)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when cProfile is already active for another job in this process."""
+
+
+class Profile(NamedTuple):
+    """Profile of one job, picklable so it can leave a worker process."""
+    format: ProfileFormat
+    data: bytes
+    seconds: float
+
+
+# Profilers of running jobs, keyed by the ident of the thread running the job
+_active: Dict[int, Union["StackSampler", "JobProfiler"]] = {}
+_active_lock = threading.Lock()
+
+
+def _register(thread_id: int, profiler: Union["StackSampler", "JobProfiler"]) -> None:
+    with _active_lock:
+        _active[thread_id] = profiler
+
+
+def _unregister(thread_id: int) -> None:
+    with _active_lock:
+        _active.pop(thread_id, None)
+
+
+def follow_thread(target: Callable[[], None]) -> Callable[[], None]:
+    """Wrap the target of a helper thread so the current job's profile covers it.
+
+    Call from the job's thread when creating the helper, e.g. the xlsx2csv
+    reader, whose parsing would otherwise only show up as queue waits in the
+    job's profile.
+
+    Args:
+        target: Function the helper thread runs
+
+    Returns:
+        ``target`` itself when the job is not profiled, otherwise a wrapper
+        that runs it under the job's profiler
+    """
+    with _active_lock:
+        profiler = _active.get(threading.get_ident())
+    if profiler is None:
+        return target
+
+    def run() -> None:
+        with profiler.thread():
+            target()
+
+    return run
+
+
+class StackSampler:
+    """Samples the stacks of a job's threads from a background thread.
+
+    Unlike cProfile, the profiled code runs at full speed between samples,
+    so it is cheap enough to leave on for every job. Helper threads started
+    through ``follow_thread`` are sampled too, under a root frame named
+    after the thread, so their time is reported apart from the job's.
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL, thread_id: Optional[int] = None):
+        """Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample; the calling thread if None
+        """
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples: Counter = Counter()
+        # Sampled threads and the root frame their stacks are reported under
+        self._threads: Dict[int, str] = {self.thread_id: ""}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StackSampler":
+        _register(self.thread_id, self)
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _unregister(self.thread_id)
+        self._stop.set()
+        self._thread.join()
+
+    @contextmanager
+    def thread(self) -> Iterator[None]:
+        """Sample the calling helper thread while the block runs."""
+        ident = threading.get_ident()
+        self._threads[ident] = f"[{threading.current_thread().name}]"
+        try:
+            yield
+        finally:
+            self._threads.pop(ident, None)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, root in list(self._threads.items()):
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack:
+                    if root:
+                        stack.append(root)
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Return the samples in collapsed stack format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class JobProfiler:
+    """cProfile over a job, including helper threads started through ``follow_thread``.
+
+    cProfile only sees the thread it is enabled in, so every followed thread
+    gets a profiler of its own; their stats are merged into the job's.
+    """
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.profilers: List[cProfile.Profile] = [cProfile.Profile()]
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "JobProfiler":
+        try:
+            self.profilers[0].enable()
+        except ValueError:
+            raise ProfilerBusyError("Another job is already being profiled with cProfile") from None
+        _register(self.thread_id, self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        try:
+            self.profilers[0].disable()
+        finally:
+            _unregister(self.thread_id)
+
+    @contextmanager
+    def thread(self) -> Iterator[None]:
+        """Profile the calling helper thread while the block runs."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler, which already sees every thread
+            yield
+            return
+        with self._lock:
+            self.profilers.append(profiler)
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+    def dumps(self) -> bytes:
+        """Return the merged stats in the marshal format pstats loads."""
+        with self._lock:
+            stats = pstats.Stats(self.profilers[0])
+            for profiler in self.profilers[1:]:
+                stats.add(profiler)
+        return marshal.dumps(stats.stats)
+
+
+def run_profiled(
+    profile_format: Optional[ProfileFormat],
+    threshold: Optional[float],
+    func: Callable[..., Any],
+    *args: Any,
+) -> Tuple[Any, Optional[Profile]]:
+    """Run a job under a profiler.
+
+    With a ``profile_format`` the profile is always returned. Without one the
+    job is sampled, and the profile is only kept if the job took at least
+    ``threshold`` seconds.
+
+    Args:
+        profile_format: Requested profile format, or None
+        threshold: Seconds after which an unrequested profile is kept
+        func: Job to run
+        args: Arguments for ``func``
+
+    Returns:
+        Tuple of (job result, profile or None)
+
+    Raises:
+        ProfilerBusyError: If a pstats profile is requested while cProfile
+            is already active in this process
+    """
+    start = time.perf_counter()
+    if profile_format == "pstats":
+        with JobProfiler() as profiler:
+            result = func(*args)
+        return result, Profile("pstats", profiler.dumps(), time.perf_counter() - start)
+
+    with StackSampler() as sampler:
+        result = func(*args)
+    seconds = time.perf_counter() - start
+    if profile_format is None and (threshold is None or seconds < threshold):
+        return result, None
+    return result, Profile("collapsed", sampler.collapsed().encode("utf-8"), seconds)
+
+
+def save_profile(profile: Profile, directory: str, label: str) -> str:
+    """Write a profile to disk, keeping only the newest ``PROFILE_KEEP_FILES`` files.
+
+    Args:
+        profile: Profile to write
+        directory: Directory holding saved profiles
+        label: Describes the job, e.g. rule ID and file name
+
+    Returns:
+        Path of the written file
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = re.sub(r"[^\w.-]+", "_", label)
+    path = os.path.join(
+        directory,
+        f"{time.strftime('%Y%m%d-%H%M%S')}-{profile.seconds:.0f}s-{name}.{PROFILE_EXTENSIONS[profile.format]}"
+    )
+    with open(path, "wb") as f:
+        f.write(profile.data)
+
+    saved = sorted(
+        (entry for entry in os.scandir(directory) if entry.is_file()),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in saved[:-PROFILE_KEEP_FILES]:
+        os.remove(entry.path)
+    return path
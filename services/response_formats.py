@@ -0,0 +1,219 @@
+"""Module for serializing validated data in fast, non-record response formats."""
+import json
+import time
+from io import BytesIO
+from typing import Iterator, Optional, Union
+
+import pandas as pd
+from fastapi import HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+
+from schemas.validation_response import ErrorFormat, ValidationResponse
+from services.metrics import observe
+from services.validators import ValidationErrors
+
+# Media types understood by the validation endpoint, mapped to format names
+RESPONSE_MEDIA_TYPES = {
+    "application/json": "json",
+    "application/vnd.columnar+json": "columns",
+    "application/x-ndjson": "ndjson",
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/vnd.apache.parquet": "parquet",
+}
+
+FORMAT_MEDIA_TYPES = {name: media_type for media_type, name in RESPONSE_MEDIA_TYPES.items()}
+
+# Number of rows serialized per NDJSON block
+NDJSON_BATCH_SIZE = 5000
+
+# Result handed back by a validation job: a full response, pre-serialized bytes
+# or the validated frame (for NDJSON, which is serialized while streaming)
+ValidationResult = Union[ValidationResponse, bytes, pd.DataFrame]
+
+
+def negotiate_response_format(accept: Optional[str]) -> str:
+    """Pick a response format from an ``Accept`` header.
+
+    Media ranges are ranked by their ``q`` parameter; the first supported one
+    wins. Missing headers and wildcards fall back to plain JSON.
+
+    Args:
+        accept: Raw ``Accept`` header value
+
+    Returns:
+        Format name: "json", "columns", "ndjson", "arrow" or "parquet"
+
+    Raises:
+        HTTPException: 406 if none of the accepted media types is supported
+    """
+    if not accept:
+        return "json"
+
+    candidates = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media_type.lower()))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type in RESPONSE_MEDIA_TYPES:
+            return RESPONSE_MEDIA_TYPES[media_type]
+        if media_type in ("*/*", "application/*"):
+            return "json"
+
+    raise HTTPException(
+        status_code=status.HTTP_406_NOT_ACCEPTABLE,
+        detail=f"Supported media types: {list(RESPONSE_MEDIA_TYPES)}"
+    )
+
+
+def render_validation_result(
+    errors: ValidationErrors,
+    validated: Optional[pd.DataFrame],
+    response_format: str = "json",
+    error_format: ErrorFormat = "rows",
+) -> ValidationResult:
+    """Turn validator output into a result for the requested format.
+
+    Errors are always reported through ``ValidationResponse``. Validated data
+    is serialized straight from the DataFrame for every format but "json",
+    skipping per-row dicts and Pydantic validation.
+
+    Args:
+        errors: Errors collected by the validator
+        validated: Converted DataFrame, or None if there are errors
+        response_format: Format name from ``negotiate_response_format``
+        error_format: Shape of the error map: "rows", "columns" or "ranges"
+
+    Returns:
+        ValidationResponse, serialized bytes, or the DataFrame for NDJSON
+    """
+    if response_format == "ndjson" and not errors and validated is not None:
+        # Timed by iter_ndjson while the response streams
+        return validated
+
+    start = time.perf_counter()
+    if errors or validated is None:
+        result = errors.to_response([], error_format)
+    elif response_format == "json":
+        result = errors.to_response(validated.to_dict(orient="records"), error_format)
+    elif response_format == "columns":
+        result = frame_to_columnar_json(validated)
+    else:
+        result = frame_to_arrow_bytes(validated, parquet=response_format == "parquet")
+    observe("serialization_seconds", time.perf_counter() - start, response_format)
+    return result
+
+
+def to_http_response(result: ValidationResult, response_format: str) -> Union[ValidationResponse, Response]:
+    """Wrap a validation result in the HTTP response for its format.
+
+    Args:
+        result: Result from ``render_validation_result``
+        response_format: Format name from ``negotiate_response_format``
+
+    Returns:
+        ValidationResponse for JSON/errors, otherwise a raw or streaming Response
+    """
+    if isinstance(result, ValidationResponse):
+        return result
+    media_type = FORMAT_MEDIA_TYPES[response_format]
+    if isinstance(result, pd.DataFrame):
+        return StreamingResponse(iter_ndjson(result), media_type=media_type)
+    return Response(content=result, media_type=media_type)
+
+
+def frame_to_columnar_json(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame as ``{"errors": {}, "columns": [...], "data": {column: [values]}}``.
+
+    Each column is encoded by pandas' C JSON writer in one call.
+
+    Args:
+        df: Validated DataFrame
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    columns = [str(col) for col in df.columns]
+    body = ",".join(
+        f"{json.dumps(name, ensure_ascii=False)}:"
+        f"{df.iloc[:, i].to_json(orient='values', date_format='iso', force_ascii=False)}"
+        for i, name in enumerate(columns)
+    )
+    return (
+        f'{{"errors":{{}},"columns":{json.dumps(columns, ensure_ascii=False)},"data":{{{body}}}}}'
+    ).encode("utf-8")
+
+
+def iter_ndjson(df: pd.DataFrame, batch_size: int = NDJSON_BATCH_SIZE) -> Iterator[bytes]:
+    """Yield a DataFrame as newline-delimited JSON records, one block at a time.
+
+    Args:
+        df: Validated DataFrame
+        batch_size: Number of rows serialized per block
+
+    Yields:
+        UTF-8 encoded NDJSON blocks
+    """
+    serializing = 0.0
+    try:
+        for start in range(0, len(df), batch_size):
+            block_start = time.perf_counter()
+            block = df.iloc[start:start + batch_size].to_json(
+                orient="records", lines=True, date_format="iso", force_ascii=False
+            )
+            if not block.endswith("\n"):
+                block += "\n"
+            serializing += time.perf_counter() - block_start
+            yield block.encode("utf-8")
+    finally:
+        observe("serialization_seconds", serializing, "ndjson")
+
+
+def frame_to_arrow_bytes(df: pd.DataFrame, parquet: bool = False) -> bytes:
+    """Serialize a DataFrame as an Arrow IPC stream or a Parquet file.
+
+    Args:
+        df: Validated DataFrame
+        parquet: Write Parquet instead of an Arrow IPC stream
+
+    Returns:
+        Serialized bytes
+
+    Raises:
+        HTTPException: 406 if pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Arrow and Parquet responses require the pyarrow package"
+        )
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Columns without a rule may mix Python types; ship those as strings
+        mixed = {
+            col: df[col].where(df[col].isna(), df[col].astype(str))
+            for col in df.columns if df[col].dtype == object
+        }
+        table = pa.Table.from_pandas(df.assign(**mixed), preserve_index=False)
+
+    sink = BytesIO()
+    if parquet:
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue()
@@ -0,0 +1,94 @@
+"""Module for sharing compiled validation rules and reloading them when they change."""
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from services.validators import Validator
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class RuleReloader:
+    """Holds one Validator compiled from a rules module, shared by all requests.
+
+    When the module's file changes on disk the module is re-imported and its
+    rules compiled into a new Validator, which replaces the old one for
+    requests that start afterwards; requests already running keep the plans
+    they started with. If the changed rules fail to import or compile, the
+    error is logged and the previous rules stay in use.
+    """
+
+    def __init__(
+        self,
+        module_name: str = "config.rules",
+        attribute: str = "VALIDATION_RULES",
+        check_interval: Optional[float] = 2.0,
+    ):
+        """Import the rules module and compile its rules.
+
+        Args:
+            module_name: Module holding the rules
+            attribute: Name of the rules dictionary in the module
+            check_interval: Minimum seconds between checks of the module's
+                modification time; None disables hot reload
+        """
+        self.module_name = module_name
+        self.attribute = attribute
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._module = importlib.import_module(module_name)
+        self._mtime = self._module_mtime()
+        self._checked_at = time.monotonic()
+        self._validator = Validator(getattr(self._module, attribute))
+
+    def _module_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self._module.__file__).st_mtime
+        except (OSError, TypeError):
+            return None
+
+    def get(self) -> Validator:
+        """Return the current Validator, reloading the rules first if their file changed.
+
+        Returns:
+            Validator compiled from the latest valid rules
+        """
+        if self.check_interval is not None and time.monotonic() - self._checked_at >= self.check_interval:
+            with self._lock:
+                if time.monotonic() - self._checked_at >= self.check_interval:
+                    self._checked_at = time.monotonic()
+                    mtime = self._module_mtime()
+                    if mtime != self._mtime:
+                        # Broken rules are retried once the file changes again, not on every check
+                        self._mtime = mtime
+                        try:
+                            self._reload()
+                        except Exception:
+                            logger.exception(f"Could not reload {self.module_name}; keeping the previous rules")
+        return self._validator
+
+    def reload(self) -> Validator:
+        """Re-import the rules module and recompile it, whether or not it changed.
+
+        Returns:
+            Validator compiled from the reloaded rules
+
+        Raises:
+            Exception: Whatever importing or compiling the rules raised; the
+                previous rules stay in use
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            return self._reload()
+
+    def _reload(self) -> Validator:
+        mtime = self._module_mtime()
+        module = importlib.reload(self._module)
+        validator = Validator(getattr(module, self.attribute))
+        self._module, self._mtime, self._validator = module, mtime, validator
+        logger.info(f"Reloaded validation rules from {self.module_name}: {sorted(validator.plans)}")
+        return validator
@@ -1,56 +1,138 @@
 """Tax service module implementing repository pattern for tax operations."""
-from typing import List, Dict, Tuple, Any, Union, Optional
+import base64
+import binascii
+import inspect
+import json
+import logging
+import time
+from typing import AsyncIterator, List, Dict, Tuple, Any, Callable, Union, Optional
 from abc import ABC, abstractmethod
 
-from data.database_helper import DatabaseHelper
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from config.config import TAX_CACHE_MAX_SIZE, TAX_CACHE_TTL, TAX_VERSION_RETRY, TAX_VERSION_TTL
+from data.database_helper import DatabaseHelper, ProcedureCall, RowFormat, shape_rows
+from data.async_database_helper import AsyncDatabaseHelper
+from services.lookup_cache import LookupCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Either helper can back the repository; async helpers are awaited natively
+DbHelper = Union[DatabaseHelper, AsyncDatabaseHelper]
+
+# Result of a read in any RowFormat: a list of dicts, or columns plus rows/values
+Rows = Union[List[Dict[str, Any]], Dict[str, Any]]
+
+# Process-wide cache for dropdown and get-by-id lookups, shared by all TaxService instances
+tax_lookup_cache = LookupCache(max_size=TAX_CACHE_MAX_SIZE, ttl=TAX_CACHE_TTL)
+
+# Stored procedure argument order for create and update
+CREATE_PARAMS = (
+    'tax_code_rcd', 'tax_rule_rcd', 'tax_code_ref_name_e', 'tax_code_ref_name_l', 'seq_num',
+    'must_not_change_flag', 'user_defined_rate_flag', 'created_by_user_id', 'tax_rate'
+)
+UPDATE_PARAMS = (
+    'tax_code_rcd', 'tax_rule_rcd', 'tax_code_ref_name_e', 'tax_code_ref_name_l', 'seq_num',
+    'must_not_change_flag', 'user_defined_rate_flag', 'lu_user_id', 'tax_rate', 'status'
+)
+
+# Change counter bumped by the triggers in data/sql/tax_code_ref_notify.sql
+VERSION_QUERY = "SELECT version FROM tax_code_ref_version"
 
 
 class ITaxRepository(ABC):
     """Interface for tax repository operations."""
     
     @abstractmethod
-    def create(self, **kwargs) -> Tuple[Optional[str], str]:
+    async def create(self, **kwargs) -> Tuple[Optional[str], str]:
         """Create a new tax code reference."""
         pass
     
     @abstractmethod
-    def update(self, **kwargs) -> Tuple[Optional[str], str]:
+    async def update(self, **kwargs) -> Tuple[Optional[str], str]:
         """Update an existing tax code reference."""
         pass
     
     @abstractmethod
-    def delete_multiple(self, json_list_id: str, updated_by: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def create_many(self, items: List[Dict[str, Any]], batch_size: int) -> List[Tuple[Optional[str], str]]:
+        """Create many tax code references in batched transactions."""
+        pass
+    
+    @abstractmethod
+    async def update_many(self, items: List[Dict[str, Any]], batch_size: int) -> List[Tuple[Optional[str], str]]:
+        """Update many tax code references in batched transactions."""
+        pass
+    
+    @abstractmethod
+    async def delete_multiple(self, json_list_id: str, updated_by: str) -> Tuple[List[Dict[str, Any]], str]:
         """Delete multiple tax code references."""
         pass
     
     @abstractmethod
-    def get_by_id(self, tax_code_rcd: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def get_by_id(self, tax_code_rcd: str) -> Tuple[List[Dict[str, Any]], str]:
         """Get tax code reference by ID."""
         pass
     
     @abstractmethod
-    def get_dropdown(self, lang: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def get_many_by_id(self, tax_code_rcds: List[str]) -> Tuple[Dict[str, List[Dict[str, Any]]], str]:
+        """Get several tax code references by ID."""
+        pass
+    
+    @abstractmethod
+    async def get_dropdown(self, lang: str, row_format: RowFormat = "dict") -> Tuple[Rows, str]:
         """Get list of tax code references for dropdown."""
         pass
     
     @abstractmethod
-    def search(self, **kwargs) -> Tuple[List[Dict[str, Any]], str]:
+    async def search(self, **kwargs) -> Tuple[Rows, str]:
         """Search for tax code references."""
         pass
+    
+    @abstractmethod
+    async def search_after(self, **kwargs) -> Tuple[Rows, str]:
+        """Search for tax code references after a sort key, in search order."""
+        pass
+    
+    @abstractmethod
+    def stream_search(self, batch_size: int, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream every matching tax code reference in batches."""
+        pass
+    
+    @abstractmethod
+    async def get_version(self) -> Tuple[Optional[int], str]:
+        """Get the change counter of the tax code reference table."""
+        pass
 
 
 class TaxRepository(ITaxRepository):
     """Implementation of tax repository using stored procedures."""
     
-    def __init__(self, db_helper: DatabaseHelper):
+    def __init__(self, db_helper: DbHelper):
         """Initialize with database helper.
         
         Args:
-            db_helper: DatabaseHelper instance
+            db_helper: DatabaseHelper or AsyncDatabaseHelper instance
         """
         self.db = db_helper
     
-    def create(self, **kwargs) -> Tuple[Optional[str], str]:
+    @staticmethod
+    async def _run(method: Callable[..., Any], *params: Any, **kwargs: Any) -> Any:
+        """Call a helper method without blocking the event loop.
+        
+        Async helper methods are awaited; sync ones run in the threadpool,
+        which is safe because each request gets its own helper instance.
+        """
+        if inspect.iscoroutinefunction(method):
+            return await method(*params, **kwargs)
+        return await run_in_threadpool(method, *params, **kwargs)
+    
+    @staticmethod
+    def _params(data: Dict[str, Any], names: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """Pick stored procedure arguments out of a dict, in procedure order."""
+        return tuple(data.get(name) for name in names)
+    
+    async def create(self, **kwargs) -> Tuple[Optional[str], str]:
         """Create a new tax code reference.
         
         Args:
@@ -67,23 +149,16 @@ class TaxRepository(ITaxRepository):
         Returns:
             Tuple containing (result, error_message)
         """
-        result, error = self.db.execute_scalar_stored_procedure(
+        result, error = await self._run(
+            self.db.execute_scalar_stored_procedure,
             "sp_tax_code_ref_create",
-            kwargs.get('tax_code_rcd'),
-            kwargs.get('tax_rule_rcd'),
-            kwargs.get('tax_code_ref_name_e'),
-            kwargs.get('tax_code_ref_name_l'),
-            kwargs.get('seq_num'),
-            kwargs.get('must_not_change_flag'),
-            kwargs.get('user_defined_rate_flag'),
-            kwargs.get('created_by_user_id'),
-            kwargs.get('tax_rate')
+            *self._params(kwargs, CREATE_PARAMS)
         )
         if not error:
             return result, ""
         return None, error
     
-    def update(self, **kwargs) -> Tuple[Optional[str], str]:
+    async def update(self, **kwargs) -> Tuple[Optional[str], str]:
         """Update an existing tax code reference.
         
         Args:
@@ -101,24 +176,50 @@ class TaxRepository(ITaxRepository):
         Returns:
             Tuple containing (result, error_message)
         """
-        result, error = self.db.execute_scalar_stored_procedure(
+        result, error = await self._run(
+            self.db.execute_scalar_stored_procedure,
             "sp_tax_code_ref_update",
-            kwargs.get('tax_code_rcd'),
-            kwargs.get('tax_rule_rcd'),
-            kwargs.get('tax_code_ref_name_e'),
-            kwargs.get('tax_code_ref_name_l'),
-            kwargs.get('seq_num'),
-            kwargs.get('must_not_change_flag'),
-            kwargs.get('user_defined_rate_flag'),
-            kwargs.get('lu_user_id'),
-            kwargs.get('tax_rate'),
-            kwargs.get('status')
+            *self._params(kwargs, UPDATE_PARAMS)
         )
         if not error:
             return result, ""
         return None, error
     
-    def delete_multiple(self, json_list_id: str, updated_by: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def create_many(self, items: List[Dict[str, Any]], batch_size: int) -> List[Tuple[Optional[str], str]]:
+        """Create many tax code references in batched transactions.
+        
+        Args:
+            items: Tax data dicts with the same keys as ``create``
+            batch_size: Maximum number of rows per transaction
+            
+        Returns:
+            One (result, error_message) tuple per item, in input order
+        """
+        return await self._run(
+            self.db.execute_scalar_stored_procedure_batch,
+            "sp_tax_code_ref_create",
+            [self._params(item, CREATE_PARAMS) for item in items],
+            batch_size
+        )
+    
+    async def update_many(self, items: List[Dict[str, Any]], batch_size: int) -> List[Tuple[Optional[str], str]]:
+        """Update many tax code references in batched transactions.
+        
+        Args:
+            items: Tax data dicts with the same keys as ``update``
+            batch_size: Maximum number of rows per transaction
+            
+        Returns:
+            One (result, error_message) tuple per item, in input order
+        """
+        return await self._run(
+            self.db.execute_scalar_stored_procedure_batch,
+            "sp_tax_code_ref_update",
+            [self._params(item, UPDATE_PARAMS) for item in items],
+            batch_size
+        )
+    
+    async def delete_multiple(self, json_list_id: str, updated_by: str) -> Tuple[List[Dict[str, Any]], str]:
         """Delete multiple tax code references.
         
         Args:
@@ -128,7 +229,8 @@ class TaxRepository(ITaxRepository):
         Returns:
             Tuple containing (result, error_message)
         """
-        result, error = self.db.execute_stored_procedure_return_data(
+        result, error = await self._run(
+            self.db.execute_stored_procedure_return_data,
             "sp_tax_code_ref_delete_multi", 
             json_list_id, 
             updated_by
@@ -137,7 +239,7 @@ class TaxRepository(ITaxRepository):
             return result, ""
         return [], error
     
-    def get_by_id(self, tax_code_rcd: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def get_by_id(self, tax_code_rcd: str) -> Tuple[List[Dict[str, Any]], str]:
         """Get tax code reference by ID.
         
         Args:
@@ -146,7 +248,8 @@ class TaxRepository(ITaxRepository):
         Returns:
             Tuple containing (result, error_message)
         """
-        result, error = self.db.execute_stored_procedure_return_data(
+        result, error = await self._run(
+            self.db.execute_stored_procedure_return_data,
             "sp_tax_code_ref_get_by_id", 
             tax_code_rcd
         )
@@ -154,24 +257,46 @@ class TaxRepository(ITaxRepository):
             return result, ""
         return [], error
     
-    def get_dropdown(self, lang: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def get_many_by_id(self, tax_code_rcds: List[str]) -> Tuple[Dict[str, List[Dict[str, Any]]], str]:
+        """Get several tax code references by ID in one pipelined round trip.
+        
+        Args:
+            tax_code_rcds: Tax code record IDs
+            
+        Returns:
+            Tuple containing (rows keyed by ID, error_message)
+        """
+        tax_code_rcds = list(dict.fromkeys(tax_code_rcds))
+        results = await self._run(
+            self.db.execute_pipeline,
+            [ProcedureCall("sp_tax_code_ref_get_by_id", (tax_code_rcd,)) for tax_code_rcd in tax_code_rcds]
+        )
+        errors = [error for _, error in results if error]
+        if errors:
+            return {}, errors[0]
+        return {tax_code_rcd: rows for tax_code_rcd, (rows, _) in zip(tax_code_rcds, results)}, ""
+    
+    async def get_dropdown(self, lang: str, row_format: RowFormat = "dict") -> Tuple[Rows, str]:
         """Get list of tax code references for dropdown.
         
         Args:
             lang: Language code
+            row_format: Result layout, see RowFormat
             
         Returns:
             Tuple containing (result, error_message)
         """
-        result, error = self.db.execute_stored_procedure_return_data(
+        result, error = await self._run(
+            self.db.execute_stored_procedure_return_data,
             "sp_tax_code_ref_get_list_dropdown", 
-            lang
+            lang,
+            row_format=row_format
         )
         if not error:
             return result, ""
         return [], error
 
-    def search(self, **kwargs) -> Tuple[List[Dict[str, Any]], str]:
+    async def search(self, **kwargs) -> Tuple[Rows, str]:
         """Search for tax code references.
   
         Args:
@@ -181,52 +306,265 @@ class TaxRepository(ITaxRepository):
             tax_code_rcd: Optional tax code record ID filter
             tax_rule_rcd: Optional tax rule record ID filter
             tax_code_ref_name: Optional reference name filter
+            row_format: Result layout, see RowFormat; "dict" by default
             
         Returns:
             Tuple containing (result, error_message)
         """
-        result, error = self.db.execute_stored_procedure_return_data(
+        result, error = await self._run(
+            self.db.execute_stored_procedure_return_data,
             "sp_tax_code_ref_search",
             kwargs.get('page_index'),
             kwargs.get('page_size'),
             kwargs.get('lang'),
             kwargs.get('tax_code_rcd'),
             kwargs.get('tax_rule_rcd'),
-            kwargs.get('tax_code_ref_name')
+            kwargs.get('tax_code_ref_name'),
+            row_format=kwargs.get('row_format', "dict")
         )
         if not error:
             return result, ""
         return [], error
+    
+    async def search_after(self, **kwargs) -> Tuple[Rows, str]:
+        """Search for tax code references after a sort key, in search order.
+        
+        Rows have the columns and order of ``search``, with a NULL total_count.
+  
+        Args:
+            after_seq_num: Sequence number of the last row of the previous page
+            after_tax_code_rcd: Tax code record ID of that row, or None for the first page
+            limit: Maximum number of rows
+            lang: Language code
+            tax_code_rcd: Optional tax code record ID filter
+            tax_rule_rcd: Optional tax rule record ID filter
+            tax_code_ref_name: Optional reference name filter
+            row_format: Result layout, see RowFormat; "dict" by default
+            
+        Returns:
+            Tuple containing (result, error_message)
+        """
+        result, error = await self._run(
+            self.db.execute_stored_procedure_return_data,
+            "sp_tax_code_ref_search_after",
+            kwargs.get('after_seq_num'),
+            kwargs.get('after_tax_code_rcd'),
+            kwargs.get('limit'),
+            kwargs.get('lang'),
+            kwargs.get('tax_code_rcd'),
+            kwargs.get('tax_rule_rcd'),
+            kwargs.get('tax_code_ref_name'),
+            row_format=kwargs.get('row_format', "dict")
+        )
+        if not error:
+            return result, ""
+        return [], error
+    
+    def stream_search(self, batch_size: int, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream every matching tax code reference in batches, in search order.
+        
+        Uses sp_tax_code_ref_search_after without a start key or limit, read
+        through a server-side cursor. Sync helpers are iterated in the threadpool.
+        
+        Args:
+            batch_size: Number of rows fetched per round trip
+            lang: Language code
+            tax_code_rcd: Optional tax code record ID filter
+            tax_rule_rcd: Optional tax rule record ID filter
+            tax_code_ref_name: Optional reference name filter
+            
+        Returns:
+            Async iterator of row batches; errors are raised while iterating
+        """
+        batches = self.db.stream_stored_procedure(
+            "sp_tax_code_ref_search_after",
+            None,
+            None,
+            None,
+            kwargs.get('lang'),
+            kwargs.get('tax_code_rcd'),
+            kwargs.get('tax_rule_rcd'),
+            kwargs.get('tax_code_ref_name'),
+            batch_size=batch_size
+        )
+        if isinstance(self.db, AsyncDatabaseHelper):
+            return batches
+        return iterate_in_threadpool(batches)
+    
+    async def get_version(self) -> Tuple[Optional[int], str]:
+        """Get the change counter of the tax code reference table.
+        
+        Returns:
+            Tuple containing (version, error_message)
+        """
+        return await self._run(self.db.execute_scalar, VERSION_QUERY)
+
+
+class DataVersionTracker:
+    """Per-process copy of the tax_code_ref change counter used as ETag.
+    
+    The counter is re-read at most every ``ttl`` seconds, so a write made by
+    another worker shows up within ``ttl`` even when no NOTIFY reaches this
+    one. A counter different from the last one read also clears the lookup
+    cache, so cached lookups are never served under an ETag newer than
+    their data. A failed read, e.g. when data/sql/tax_code_ref_notify.sql
+    is not installed, is remembered for ``retry`` seconds and logged once.
+    """
+    
+    def __init__(self, ttl: float = TAX_VERSION_TTL, retry: float = TAX_VERSION_RETRY):
+        """Initialize without a known version.
+        
+        Args:
+            ttl: Seconds a read counter is reused
+            retry: Seconds a failed read is reused before trying again
+        """
+        self.ttl = ttl
+        self.retry = retry
+        self.version: Optional[int] = None
+        self.error = ""
+        self._expires_at = 0.0
+    
+    def reset(self) -> None:
+        """Make the next lookup re-read the counter, e.g. after a write."""
+        if not self.error:
+            self._expires_at = 0.0
+    
+    async def get(
+        self, fetch: Callable[[], Any], cache: Optional[LookupCache] = None
+    ) -> Tuple[Optional[int], str]:
+        """Return the counter, reading it with ``fetch`` once the copy expired.
+        
+        Args:
+            fetch: Coroutine function returning (version, error_message)
+            cache: Lookup cache to clear when the counter changed
+            
+        Returns:
+            Tuple containing (version, error_message)
+        """
+        if time.monotonic() < self._expires_at:
+            return self.version, self.error
+        
+        version, error = await fetch()
+        if error:
+            if not self.error:
+                logger.warning(
+                    f"Could not read the tax data version, serving without ETags "
+                    f"for {self.retry} seconds: {error}"
+                )
+            self.version, self.error = None, error
+            self._expires_at = time.monotonic() + self.retry
+            return None, error
+        
+        if self.error:
+            logger.info("Tax data version readable again, serving ETags")
+        if cache is not None and self.version is not None and version != self.version:
+            cache.invalidate()
+        self.version, self.error = version, ""
+        self._expires_at = time.monotonic() + self.ttl
+        return version, ""
+
+
+# Process-wide ETag counter, shared by all TaxService instances
+tax_version_tracker = DataVersionTracker()
 
 
 class TaxService:
-    """Service class for tax operations using repository pattern."""
+    """Service class for tax operations using repository pattern.
+    
+    Dropdown and get-by-id lookups are read through a shared LookupCache;
+    every create, update and delete made through the service clears it.
+    """
     
-    def __init__(self, tax_repository: ITaxRepository):
+    def __init__(
+        self,
+        tax_repository: ITaxRepository,
+        cache: Optional[LookupCache] = None,
+        version_tracker: Optional[DataVersionTracker] = None
+    ):
         """Initialize with tax repository.
         
         Args:
             tax_repository: Repository implementing ITaxRepository interface
+            cache: Cache for lookups, or None to always hit the repository
+            version_tracker: Shared copy of the change counter, or None to
+                read it on every call
         """
         self.repository = tax_repository
+        self.cache = cache
+        self.version_tracker = version_tracker
+    
+    def _invalidate_cache(self) -> None:
+        """Drop cached lookups after a write; writes are rare, so drop them all."""
+        if self.cache is not None:
+            self.cache.invalidate()
+        if self.version_tracker is not None:
+            self.version_tracker.reset()
     
-    def create_tax_code_ref(self, **kwargs) -> Union[str, Tuple[Optional[str], str]]:
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters of the lookup cache.
+        
+        Returns:
+            Cache statistics, empty if caching is disabled
+        """
+        return self.cache.stats() if self.cache is not None else {}
+    
+    async def create_tax_code_ref(self, **kwargs) -> Union[str, Tuple[Optional[str], str]]:
         """Create a new tax code reference.
         
         Returns:
             Result or error message
         """
-        return self.repository.create(**kwargs)
+        try:
+            return await self.repository.create(**kwargs)
+        finally:
+            self._invalidate_cache()
     
-    def update_tax_code_ref(self, **kwargs) -> Union[str, Tuple[Optional[str], str]]:
+    async def update_tax_code_ref(self, **kwargs) -> Union[str, Tuple[Optional[str], str]]:
         """Update an existing tax code reference.
         
         Returns:
             Result or error message
         """
-        return self.repository.update(**kwargs)
+        try:
+            return await self.repository.update(**kwargs)
+        finally:
+            self._invalidate_cache()
     
-    def delete_multi_tax_code_ref(self, p_json_list_id: str, p_updated_by: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def create_tax_code_refs(
+        self, items: List[Dict[str, Any]], batch_size: int
+    ) -> List[Tuple[Optional[str], str]]:
+        """Create many tax code references in batched transactions.
+        
+        Args:
+            items: Tax data dicts
+            batch_size: Maximum number of rows per transaction
+            
+        Returns:
+            One (result, error_message) tuple per item
+        """
+        try:
+            return await self.repository.create_many(items, batch_size)
+        finally:
+            self._invalidate_cache()
+    
+    async def update_tax_code_refs(
+        self, items: List[Dict[str, Any]], batch_size: int
+    ) -> List[Tuple[Optional[str], str]]:
+        """Update many tax code references in batched transactions.
+        
+        Args:
+            items: Tax data dicts
+            batch_size: Maximum number of rows per transaction
+            
+        Returns:
+            One (result, error_message) tuple per item
+        """
+        try:
+            return await self.repository.update_many(items, batch_size)
+        finally:
+            self._invalidate_cache()
+    
+    async def delete_multi_tax_code_ref(self, p_json_list_id: str, p_updated_by: str) -> Tuple[List[Dict[str, Any]], str]:
         """Delete multiple tax code references.
         
         Args:
@@ -236,9 +574,30 @@ class TaxService:
         Returns:
             Tuple containing (result, error_message)
         """
-        return self.repository.delete_multiple(p_json_list_id, p_updated_by)
+        try:
+            return await self.repository.delete_multiple(p_json_list_id, p_updated_by)
+        finally:
+            self._invalidate_cache()
     
-    def get_tax_code_ref_by_id(self, tax_code_rcd: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def _cached(
+        self, key: Tuple[str, str], fetch: Callable[..., Any], *args: Any
+    ) -> Tuple[Any, str]:
+        """Serve a lookup from the cache, fetching and caching it on a miss.
+        
+        Only successful results are cached.
+        """
+        if self.cache is None:
+            return await fetch(*args)
+        found, result = self.cache.get(key)
+        if found:
+            return result, ""
+        generation = self.cache.generation
+        result, error = await fetch(*args)
+        if not error:
+            self.cache.set(key, result, generation)
+        return result, error
+    
+    async def get_tax_code_ref_by_id(self, tax_code_rcd: str) -> Tuple[List[Dict[str, Any]], str]:
         """Get tax code reference by ID.
         
         Args:
@@ -247,28 +606,77 @@ class TaxService:
         Returns:
             Tuple containing (result, error_message)
         """
-        return self.repository.get_by_id(tax_code_rcd)
+        return await self._cached(("by_id", tax_code_rcd), self.repository.get_by_id, tax_code_rcd)
     
-    def get_tax_code_ref_dropdown(self, lang: str) -> Tuple[List[Dict[str, Any]], str]:
+    async def get_tax_code_refs_by_ids(self, tax_code_rcds: List[str]) -> Tuple[Dict[str, List[Dict[str, Any]]], str]:
+        """Get several tax code references by ID.
+        
+        Args:
+            tax_code_rcds: Tax code record IDs
+            
+        Returns:
+            Tuple containing (rows keyed by ID, error_message)
+        """
+        if self.cache is None:
+            return await self.repository.get_many_by_id(tax_code_rcds)
+        
+        result = {}
+        missing = []
+        for tax_code_rcd in dict.fromkeys(tax_code_rcds):
+            found, rows = self.cache.get(("by_id", tax_code_rcd))
+            if found:
+                result[tax_code_rcd] = rows
+            else:
+                missing.append(tax_code_rcd)
+        
+        if missing:
+            generation = self.cache.generation
+            fetched, error = await self.repository.get_many_by_id(missing)
+            if error:
+                return {}, error
+            for tax_code_rcd, rows in fetched.items():
+                self.cache.set(("by_id", tax_code_rcd), rows, generation)
+            result.update(fetched)
+        return result, ""
+    
+    async def get_tax_code_ref_dropdown(self, lang: str, row_format: RowFormat = "dict") -> Tuple[Rows, str]:
         """Get list of tax code references for dropdown.
         
         Args:
             lang: Language code
+            row_format: Result layout, see RowFormat
             
         Returns:
             Tuple containing (result, error_message)
         """
-        return self.repository.get_dropdown(lang)
+        return await self._cached(
+            ("dropdown", lang, row_format), self.repository.get_dropdown, lang, row_format
+        )
+    
+    async def get_data_version(self) -> Tuple[Optional[int], str]:
+        """Get a counter that changes whenever any tax code reference changes.
+        
+        Used as the ETag of read endpoints. Read through the version tracker,
+        which re-reads it every TAX_VERSION_TTL seconds and clears the lookup
+        cache when it changed.
+        
+        Returns:
+            Tuple containing (version, error_message)
+        """
+        if self.version_tracker is None:
+            return await self.repository.get_version()
+        return await self.version_tracker.get(self.repository.get_version, self.cache)
     
-    def search_tax_code_ref(
+    async def search_tax_code_ref(
         self, 
         page_index: int, 
         page_size: int, 
         lang: str,
         tax_code_rcd: Optional[str] = None, 
         tax_rule_rcd: Optional[str] = None,
-        tax_code_ref_name: Optional[str] = None
-    ) -> Tuple[List[Dict[str, Any]], str]:
+        tax_code_ref_name: Optional[str] = None,
+        row_format: RowFormat = "dict"
+    ) -> Tuple[Rows, str]:
         """Search for tax code references.
         
         Args:
@@ -278,29 +686,174 @@ class TaxService:
             tax_code_rcd: Optional tax code record ID filter
             tax_rule_rcd: Optional tax rule record ID filter
             tax_code_ref_name: Optional reference name filter
+            row_format: Result layout, see RowFormat
             
         Returns:
             Tuple containing (result, error_message)
         """
-        return self.repository.search(
+        return await self.repository.search(
             page_index=page_index,
             page_size=page_size,
             lang=lang,
             tax_code_rcd=tax_code_rcd,
             tax_rule_rcd=tax_rule_rcd,
+            tax_code_ref_name=tax_code_ref_name,
+            row_format=row_format
+        )
+    
+    async def search_tax_code_ref_after(
+        self,
+        cursor: str,
+        page_size: int,
+        lang: str,
+        tax_code_rcd: Optional[str] = None,
+        tax_rule_rcd: Optional[str] = None,
+        tax_code_ref_name: Optional[str] = None,
+        row_format: RowFormat = "dict"
+    ) -> Tuple[Dict[str, Any], str]:
+        """Search for tax code references with keyset pagination.
+        
+        Pages hold the same columns, in the same order, as offset pages of
+        ``search_tax_code_ref``; total_count is None. Fetches one row more
+        than ``page_size`` to tell whether another page follows without
+        counting the matches.
+        
+        Args:
+            cursor: ``next_cursor`` of the previous page, or "" for the first page
+            page_size: Page size for pagination
+            lang: Language code
+            tax_code_rcd: Optional tax code record ID filter
+            tax_rule_rcd: Optional tax rule record ID filter
+            tax_code_ref_name: Optional reference name filter
+            row_format: Result layout of "data", see RowFormat
+            
+        Returns:
+            Tuple containing ({"data": rows, "next_cursor": token or None}, error_message)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after_seq_num, after_tax_code_rcd = decode_search_cursor(cursor) if cursor else (None, None)
+        result, error = await self.repository.search_after(
+            after_seq_num=after_seq_num,
+            after_tax_code_rcd=after_tax_code_rcd,
+            limit=page_size + 1,
+            lang=lang,
+            tax_code_rcd=tax_code_rcd,
+            tax_rule_rcd=tax_rule_rcd,
+            tax_code_ref_name=tax_code_ref_name,
+            row_format="rows"
+        )
+        if error:
+            return {}, error
+        columns, rows = result["columns"], result["rows"]
+        next_cursor = None
+        if len(rows) > page_size:
+            last = rows[page_size - 1]
+            next_cursor = encode_search_cursor(
+                last[columns.index("seq_num")], last[columns.index("tax_code_rcd")]
+            )
+        return {"data": shape_rows(columns, rows[:page_size], row_format), "next_cursor": next_cursor}, ""
+    
+    def export_tax_code_refs(
+        self,
+        lang: str,
+        batch_size: int,
+        tax_code_rcd: Optional[str] = None,
+        tax_rule_rcd: Optional[str] = None,
+        tax_code_ref_name: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream every tax code reference matching the filters.
+        
+        Args:
+            lang: Language code
+            batch_size: Number of rows fetched per round trip
+            tax_code_rcd: Optional tax code record ID filter
+            tax_rule_rcd: Optional tax rule record ID filter
+            tax_code_ref_name: Optional reference name filter
+            
+        Returns:
+            Async iterator of row batches; errors are raised while iterating
+        """
+        return self.repository.stream_search(
+            batch_size,
+            lang=lang,
+            tax_code_rcd=tax_code_rcd,
+            tax_rule_rcd=tax_rule_rcd,
             tax_code_ref_name=tax_code_ref_name
         )
 
 
+def encode_search_cursor(seq_num: Optional[int], tax_code_rcd: str) -> str:
+    """Encode the sort key of the last row of a page as an opaque, URL-safe cursor."""
+    token = json.dumps({"s": seq_num, "k": tax_code_rcd})
+    return base64.urlsafe_b64encode(token.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[Optional[int], str]:
+    """Decode a cursor made by ``encode_search_cursor``.
+    
+    Returns:
+        Tuple containing (seq_num, tax_code_rcd)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        token = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        seq_num, key = token["s"], token["k"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(key, str) or not (seq_num is None or type(seq_num) is int):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return seq_num, key
+
+
 # Factory function to create TaxService with proper dependencies
-def create_tax_service(db_helper: DatabaseHelper) -> TaxService:
+def create_tax_service(
+    db_helper: DbHelper,
+    cache: Optional[LookupCache] = tax_lookup_cache,
+    version_tracker: Optional[DataVersionTracker] = tax_version_tracker
+) -> TaxService:
     """Create a TaxService instance with proper repository.
     
     Args:
-        db_helper: DatabaseHelper instance
+        db_helper: DatabaseHelper or AsyncDatabaseHelper instance
+        cache: Lookup cache, shared process-wide by default
+        version_tracker: Change counter tracker, shared process-wide by default
         
     Returns:
         Configured TaxService instance
     """
     repository = TaxRepository(db_helper)
-    return TaxService(repository)
\ No newline at end of file
+    return TaxService(repository, cache, version_tracker)
+
+def evict_tax_code_refs(
+    payload: str,
+    cache: LookupCache = tax_lookup_cache,
+    version_tracker: DataVersionTracker = tax_version_tracker
+) -> None:
+    """Evict lookups affected by a change notification from tax_code_ref.
+    
+    The payload is sent by the triggers in data/sql/tax_code_ref_notify.sql:
+    ``{"op": ..., "keys": [...]}`` for the changed tax codes, or
+    ``{"op": ..., "all": true}`` for large statements. Dropdowns list every
+    code, so they are dropped on any change.
+    
+    Args:
+        payload: JSON notification payload
+        cache: Lookup cache to evict from
+        version_tracker: Tracker whose counter is re-read on the next lookup
+    """
+    version_tracker.reset()
+    try:
+        change = json.loads(payload)
+        keys = None if change.get("all") else set(change["keys"])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        logger.warning(f"Unreadable tax_code_ref notification, clearing cache: {payload!r}")
+        keys = None
+    
+    if keys is None:
+        cache.invalidate()
+        return
+    cache.invalidate_matching(lambda key: key[0] != "by_id" or key[1] in keys)
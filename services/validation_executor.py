@@ -0,0 +1,289 @@
+"""Module for running file read + validation jobs off the event loop."""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+
+from schemas.validation_response import ErrorFormat, ValidationLoadResponse
+from services.data_loader import DataLoader
+from services.file_readers import FileReader
+from services.metrics import replay, run_recorded
+from services.response_formats import ValidationResult, render_validation_result
+from services.validators import Validator
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+
+class ValidationJobError(Exception):
+    """Picklable carrier for HTTP errors raised inside a worker process."""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def run_validation_job(
+    file_reader: FileReader,
+    validator: Validator,
+    path: str,
+    rule_id: str,
+    chunked: bool = False,
+    error_format: ErrorFormat = "rows",
+    response_format: str = "json",
+) -> ValidationResult:
+    """Read an Excel file from disk, validate it and serialize the result.
+
+    Runs inside a worker thread or process, so it only takes picklable
+    arguments and never touches the event loop of the caller. Serialization
+    to the negotiated format happens here too, keeping it off the loop.
+
+    Args:
+        file_reader: FileReader holding the converter strategy
+        validator: Validator holding the validation rules
+        path: Path to the spooled Excel file
+        rule_id: ID of validation rules to apply
+        chunked: Whether to read and validate the file chunk by chunk
+        error_format: Shape of the error map: "rows", "columns" or "ranges"
+        response_format: Format name from ``negotiate_response_format``
+
+    Returns:
+        ValidationResponse, serialized bytes, or the validated DataFrame for NDJSON
+
+    Raises:
+        ValidationJobError: If the validator rejects the rule ID or columns
+    """
+    try:
+        if chunked:
+            dtype = validator.get_reader_dtypes(rule_id)
+            chunks = file_reader.iter_path_chunks(path, dtype=dtype)
+            try:
+                errors, validated = validator.validate_chunks_frame(chunks, rule_id)
+            finally:
+                chunks.close()
+        else:
+            df = file_reader.read_excel_path(path, dtype=validator.get_reader_dtypes(rule_id))
+            errors, validated = validator.validate_frame(df, rule_id)
+        return render_validation_result(errors, validated, response_format, error_format)
+    except HTTPException as e:
+        raise ValidationJobError(e.status_code, e.detail)
+
+
+def run_validation_load_job(
+    file_reader: FileReader,
+    validator: Validator,
+    data_loader: DataLoader,
+    path: str,
+    rule_id: str,
+    chunked: bool = False,
+    error_format: ErrorFormat = "rows",
+    loaded_by: str = "",
+) -> ValidationLoadResponse:
+    """Read an Excel file from disk, validate it and load it into PostgreSQL.
+
+    In chunked mode validated chunks are streamed into COPY while the rest of
+    the file is still being read; if a later chunk fails validation, the
+    whole load is rolled back.
+
+    Args:
+        file_reader: FileReader holding the converter strategy
+        validator: Validator holding the validation rules
+        data_loader: DataLoader holding the load targets
+        path: Path to the spooled Excel file
+        rule_id: ID of validation rules to apply
+        chunked: Whether to read, validate and load the file chunk by chunk
+        error_format: Shape of the error map: "rows", "columns" or "ranges"
+        loaded_by: User ID recorded on the loaded rows
+
+    Returns:
+        ValidationLoadResponse with either the errors or the load summary
+
+    Raises:
+        ValidationJobError: If the rule ID, columns or load target are
+            invalid, or the load fails
+    """
+    try:
+        target = data_loader.get_target(rule_id)
+        if chunked:
+            dtype = validator.get_reader_dtypes(rule_id)
+            chunks = file_reader.iter_path_chunks(path, dtype=dtype)
+            try:
+                errors, validated_chunks = validator.iter_validated_chunks(chunks, rule_id)
+                loaded, error = data_loader.load(validated_chunks, rule_id, loaded_by, errors)
+            finally:
+                chunks.close()
+        else:
+            df = file_reader.read_excel_path(path, dtype=validator.get_reader_dtypes(rule_id))
+            errors, validated = validator.validate_frame(df, rule_id)
+            loaded, error = (0, "") if errors else data_loader.load([validated], rule_id, loaded_by)
+
+        if errors:
+            return ValidationLoadResponse.model_validate(errors.to_response([], error_format).model_dump())
+        if error:
+            raise ValidationJobError(status.HTTP_500_INTERNAL_SERVER_ERROR, error)
+        return ValidationLoadResponse(table=target["table"], loaded_rows=loaded)
+    except HTTPException as e:
+        raise ValidationJobError(e.status_code, e.detail)
+
+
+class ValidationExecutor:
+    """Bounded executor for CPU-bound validation jobs.
+
+    Jobs are handed to a thread or process pool so the event loop keeps
+    serving other requests. At most ``max_pending`` jobs are admitted
+    (running plus queued); beyond that callers get a 429 straight away
+    instead of piling up behind a busy pool.
+    """
+
+    def __init__(
+        self,
+        mode: str = "process",
+        max_workers: int = 2,
+        max_pending: int = 8,
+        timeout: Optional[float] = None,
+    ):
+        """Initialize executor settings; the pool itself is created lazily.
+
+        Args:
+            mode: One of "inline", "thread" or "process"
+            max_workers: Number of pool workers
+            max_pending: Maximum number of admitted jobs, running or queued
+            timeout: Seconds to wait for a job before answering 504
+        """
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Invalid executor mode: {mode}, expected one of {EXECUTOR_MODES}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether jobs are offloaded to a pool."""
+        return self.mode != "inline"
+
+    @property
+    def pending(self) -> int:
+        """Number of admitted jobs that have not finished yet."""
+        return self._pending
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="validation"
+                )
+        return self._pool
+
+    def reserve(self) -> None:
+        """Take an admission slot before the job's input is prepared.
+
+        Lets callers answer 429 before spooling an upload to disk. The slot
+        is handed to ``submit(..., reserved=True)``, or given back with
+        ``release`` if the job is never submitted.
+
+        Raises:
+            HTTPException: 429 when saturated
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many validation jobs in progress, please retry later",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+    def release(self) -> None:
+        """Give back an admission slot."""
+        with self._lock:
+            self._pending -= 1
+
+    async def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        cleanup: Optional[Callable[[], None]] = None,
+        reserved: bool = False,
+    ) -> Any:
+        """Run ``func(*args)`` in the pool and await its result.
+
+        The admission slot and ``cleanup`` are released when the job really
+        finishes, not when the caller stops waiting, so a timed-out job that
+        is still running keeps counting against ``max_pending``.
+
+        Args:
+            func: Picklable top-level callable
+            args: Picklable arguments for ``func``
+            cleanup: Optional callback run once the job is done
+            reserved: Whether the caller already took the slot with ``reserve``
+
+        Returns:
+            The job result
+
+        Raises:
+            HTTPException: 429 when saturated, 504 on timeout, or the HTTP
+                error raised by the job
+        """
+        if not reserved:
+            try:
+                self.reserve()
+            except HTTPException:
+                if cleanup:
+                    cleanup()
+                raise
+
+        try:
+            if self.mode == "process":
+                # Metrics observed in the worker come back with the result
+                future = self._get_pool().submit(run_recorded, func, *args)
+            else:
+                future = self._get_pool().submit(func, *args)
+        except Exception:
+            self.release()
+            if cleanup:
+                cleanup()
+            raise
+
+        def on_done(_: Future) -> None:
+            self.release()
+            if cleanup:
+                try:
+                    cleanup()
+                except Exception:
+                    logger.exception("Validation job cleanup failed")
+
+        future.add_done_callback(on_done)
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Validation job {func.__name__} timed out after {self.timeout} seconds")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Validation did not finish within {self.timeout} seconds"
+            )
+        except ValidationJobError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+        if self.mode == "process":
+            result, observations = result
+            replay(observations)
+        return result
+
+    def shutdown(self) -> None:
+        """Shut down the pool, cancelling jobs that have not started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None